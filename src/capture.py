@@ -0,0 +1,388 @@
+
+"""Fetch/parse split: capture raw JD_COL HTML now, parse it offline later.
+
+In capture mode (iter_jobs(capture=...)) the browser only navigates:
+for every joblisting the outerHTML of the job description column is
+written to a gzip compressed JSON lines file by a CaptureWriter.
+
+The offline parser rebuilds the exact record schema of
+extract_jobinfo() from those snapshots with the WebScrapingLocators
+selectors and WebScrapingElements.parse_jobinfo(), in a
+ProcessPoolExecutor, without a browser. Captures can be re-parsed
+whenever the schema changes.
+
+Functions:
+
+    session_paths(path)
+        The files written by every CaptureWriter of path.
+
+    read_captures(paths)
+        Yields every snapshot of the capture files.
+
+    get_jobinfo_texts_from_html(html)
+        The offline equivalent of get_jobinfo_script().
+
+    parse_capture(snapshot)
+        Parses a single snapshot into a job record.
+
+    iter_parsed_captures(paths, n_workers=None, chunksize=64)
+        Yields the parsed job records of the capture files in order.
+
+    parse_captures(paths, n_workers=None, chunksize=64)
+        Collects iter_parsed_captures() into a DataFrame.
+
+"""
+
+import os
+import gzip
+import json
+import time
+import zlib
+
+from html.parser import HTMLParser
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+from selenium.webdriver.common.by import By
+
+from elements import WebScrapingElements
+from records import jobs_to_frame
+from locators import WebScrapingLocators as WSL
+
+
+# WSL = WebScrapingLocators
+
+
+# The file of capture session n of path: path itself for the first
+# session, then "<name>.<n>.<extensions>" (e.g. captures.1.jsonl.gz).
+def get_session_path(path, n):
+    if n == 0:
+        return path
+    directory, name = os.path.split(path)
+    stem, _, extensions = name.partition(".")
+    return os.path.join(directory, f"{stem}.{n}.{extensions}" if extensions else f"{stem}.{n}")
+
+
+def session_paths(path):
+    paths = []
+    while os.path.exists(get_session_path(path, len(paths))):
+        paths.append(get_session_path(path, len(paths)))
+    return paths
+
+
+
+class CaptureWriter:
+    """CaptureWriter writes JD_COL snapshots to a gzip compressed JSON
+    lines file. Each line is {"page", "job key", "captured at", "html"}.
+
+    Every snapshot is sync flushed, so a crash loses at most the snapshot
+    being written; read_captures() stops cleanly at a truncated end.
+
+    Every writer starts a new file (see session_paths()) rather than
+    appending to path: a gzip stream cut off by a crash has no trailer,
+    and anything appended after it could not be decompressed. 
+    read_captures(path) reads the files of every session of path.
+
+    """
+
+    def __init__(self, path):
+        n = 0
+        while os.path.exists(get_session_path(path, n)):
+            n += 1
+        self.path = get_session_path(path, n)
+        self.file = gzip.open(self.path, "wb")
+    
+    
+    def write(self, page, key, html):
+        snapshot = {
+            "page": page,
+            "job key": key,
+            "captured at": time.time(),
+            "html": html
+        }
+        self.file.write((json.dumps(snapshot) + "\n").encode("utf-8"))
+        self.file.flush(zlib.Z_SYNC_FLUSH)
+    
+    
+    def close(self):
+        self.file.close()
+
+
+
+# Decompresses chunk with decompressor, going on to the next member of a
+# multi member gzip file. Returns the data, the decompressor to continue 
+# with and whether the stream is corrupt; on a corrupt stream the data is
+# everything that could be decompressed before the corruption.
+def decompress_members(decompressor, chunk):
+    backup = decompressor.copy()
+    try:
+        data = decompressor.decompress(chunk)
+        while decompressor.eof and decompressor.unused_data:
+            unused_data = decompressor.unused_data
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            data += decompressor.decompress(unused_data)
+        return data, decompressor, False
+    except zlib.error:
+        if len(chunk) == 1:
+            return b"", backup, True
+
+    # Find where the corruption starts in ever smaller pieces.
+    data, decompressor = b"", backup
+    piece_size = max(1, len(chunk) // 16)
+    for start in range(0, len(chunk), piece_size):
+        piece, decompressor, is_corrupt = decompress_members(decompressor, chunk[start:start + piece_size])
+        data += piece
+        if is_corrupt:
+            break
+    return data, decompressor, True
+
+
+# Yields the lines of a gzip file as they are decompressed, so that the
+# lines before a truncated or corrupt end are kept (a buffered 
+# gzip.open() read loses the whole buffer the error is raised in).
+def read_gzip_lines(path, chunk_size=2 ** 16):
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    pending = b""
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            data, decompressor, is_corrupt = decompress_members(decompressor, chunk)
+            *lines, pending = (pending + data).split(b"\n")
+            yield from lines
+            if is_corrupt:
+                return
+    
+    # An unterminated last line is a snapshot cut off mid-write.
+    if pending:
+        yield pending
+
+
+def read_captures(paths):
+    if isinstance(paths, str):
+        paths = [paths]
+    for path in paths:
+        for session_path in session_paths(path) or [path]:
+            for line in read_gzip_lines(session_path):
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    pass
+
+
+
+# ==================================================
+# Offline DOM
+# ==================================================
+
+
+
+# Elements whose text starts on a new line (an approximation of the
+# browser's innerText, which the live extraction reads).
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3",
+    "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+    "section", "table", "tr", "ul"
+}
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr"
+}
+SKIP_TAGS = {"script", "style", "template", "noscript"}
+
+
+class Node:
+
+    def __init__(self, tag, attrs):
+        self.tag = tag
+        self.attrs = dict(attrs)
+        self.children = []
+    
+    
+    def iter_descendants(self):
+        for child in self.children:
+            if isinstance(child, Node):
+                yield child
+                yield from child.iter_descendants()
+    
+    
+    # Supports the locator strategies used by the job info locators.
+    def matches(self, locator):
+        by, value = locator
+        if by == By.ID:
+            return self.attrs.get("id") == value
+        if by == By.CLASS_NAME:
+            return value in (self.attrs.get("class") or "").split()
+        if by == By.TAG_NAME:
+            return self.tag == value
+        raise ValueError(f"Locator strategy {by} is not supported offline.")
+    
+    
+    def find_elements(self, by, value):
+        return [node for node in self.iter_descendants() if node.matches((by, value))]
+    
+    
+    def find_element(self, by, value):
+        return next((node for node in self.iter_descendants()
+                     if node.matches((by, value))), None)
+    
+    
+    # A layout container holds only elements (no loose text); each
+    # of its children is put on its own line, like the flex rows of
+    # EmpBasicInfo are by the browser.
+    def is_layout(self):
+        elements = [child for child in self.children if isinstance(child, Node)]
+        loose_text = any(child.strip() for child in self.children if isinstance(child, str))
+        return len(elements) > 1 and not loose_text
+    
+    
+    @property
+    def text(self):
+        parts = []
+
+        def walk(node):
+            layout = node.is_layout()
+            for child in node.children:
+                if isinstance(child, str):
+                    parts.append(child)
+                elif child.tag in SKIP_TAGS:
+                    continue
+                elif child.tag == "br":
+                    parts.append("\n")
+                else:
+                    block = layout or child.tag in BLOCK_TAGS
+                    if block:
+                        parts.append("\n")
+                    walk(child)
+                    if block:
+                        parts.append("\n")
+
+        walk(self)
+        lines = [" ".join(line.split()) for line in "".join(parts).split("\n")]
+        return "\n".join(line for line in lines if line)
+
+
+
+class SnapshotParser(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", [])
+        self.stack = [self.root]
+    
+    
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, attrs)
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+    
+    
+    def handle_startendtag(self, tag, attrs):
+        self.stack[-1].children.append(Node(tag, attrs))
+    
+    
+    # Pops up to the matching open tag; stray end tags are ignored.
+    def handle_endtag(self, tag):
+        for idx in range(len(self.stack) - 1, 0, -1):
+            if self.stack[idx].tag == tag:
+                del self.stack[idx:]
+                return
+    
+    
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+
+
+def parse_html(html):
+    parser = SnapshotParser()
+    parser.feed(html)
+    parser.close()
+    return parser.root
+
+
+
+# __________________________________________________
+
+
+
+# ==================================================
+# Offline Parsing
+# ==================================================
+
+
+
+# Finds through a chain of locators like the getters of elements.py do.
+def find_chain(node, locators):
+    for locator in locators:
+        if node is None:
+            return None
+        node = node.find_element(*locator)
+    return node
+
+
+def get_jobinfo_texts_from_html(html):
+    document = parse_html(html)
+    jd_col = document.find_element(*WSL.JD_COL)
+    if jd_col is None:
+        return {}
+
+    header_job_info = find_chain(jd_col, [WSL.HEADER, WSL.HEADER_JOB_INFO])
+    jobinfo1 = header_job_info.find_elements(*WSL.JOB_INFO_1)[:4] if header_job_info else []
+
+    containers = jd_col.find_elements(*WSL.JOB_INFO_2_CONTAINER)
+    jobinfo2 = containers[1].find_elements(*WSL.JOB_INFO_2)[:1] if len(containers) > 1 else []
+
+    jobinfo3 = find_chain(document, [WSL.EMP_BASIC_INFO, WSL.COMP_OVERVIEW_CONTAINER])
+    jobinfo4 = find_chain(document, [WSL.JOB_DESC_CONTAINER, WSL.JOB_INFO_4])
+
+    return {
+        "jobinfo1": [node.text for node in jobinfo1],
+        "jobinfo2": [node.text for node in jobinfo2],
+        "jobinfo3": jobinfo3.text if jobinfo3 is not None else None,
+        "jobinfo4": jobinfo4.text if jobinfo4 is not None else None
+    }
+
+
+# Runs in the iter_parsed_captures() worker processes.
+def parse_capture(snapshot):
+    jobinfo_texts = get_jobinfo_texts_from_html(snapshot["html"] or "")
+    return WebScrapingElements().parse_jobinfo(jobinfo_texts)
+
+
+def iter_parsed_captures(paths, n_workers=None, chunksize=64):
+    """Yields the parsed job records of the capture files in capture order.
+
+    Parameters
+    ----------
+    paths : str or list of str
+        The capture files written by CaptureWriter.
+    n_workers : int, optional
+        The number of parser processes (defaults to the number of CPUs).
+    chunksize : int
+        The number of snapshots sent to a worker at a time. Snapshots are
+        decompressed and submitted one batch of n_workers * chunksize at a
+        time, so memory stays bounded however large the captures are.
+
+    Returns
+    -------
+    type
+        generator
+    describe
+        Yields JobRecords, the same as extract_jobinfo().
+
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    batch_size = n_workers * chunksize
+    
+    snapshots = read_captures(paths)
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        while True:
+            batch = list(islice(snapshots, batch_size))
+            if not batch:
+                return
+            yield from executor.map(parse_capture, batch, chunksize=chunksize)
+
+
+def parse_captures(paths, n_workers=None, chunksize=64):
+    return jobs_to_frame(list(iter_parsed_captures(paths, n_workers, chunksize)))
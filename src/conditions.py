@@ -0,0 +1,66 @@
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import StaleElementReferenceException
+
+
+class text_changed_from:
+    """An expectation that the text of the element found by locator
+    is non-empty and different from previous_text.
+
+    This mirrors the callable classes in selenium's expected_conditions
+    module so it can be passed straight into WebDriverWait.until().
+
+    Returns the new text once it has changed, else False.
+
+    Note: previous_text can be None (e.g. for the very first joblisting
+    of a session) in which case any non-empty text is accepted.
+
+    """
+
+    def __init__(self, locator, previous_text):
+        self.locator = locator
+        self.previous_text = previous_text
+
+    def __call__(self, driver):
+        try:
+            text = driver.find_element(*self.locator).text
+        except (NoSuchElementException, StaleElementReferenceException):
+            return False
+        if text and text != self.previous_text:
+            return text
+        return False
+
+
+class elements_rerendered:
+    """An expectation that the list found by walking locators has been
+    re-rendered, i.e. the previously first item has gone stale and at
+    least one new item is present.
+
+    locators is a chain of locators: every locator but the last finds a
+    single element from the preceding one and the last finds all items
+    (e.g. MainCol -> ul -> all li).
+
+    Returns the list of new items, else False.
+
+    """
+
+    def __init__(self, locators, previous_item):
+        self.locators = locators
+        self.previous_item = previous_item
+
+    def __call__(self, driver):
+        if self.previous_item is not None:
+            try:
+                # Calling any method on a stale element raises.
+                self.previous_item.is_enabled()
+                return False
+            except StaleElementReferenceException:
+                pass
+        try:
+            container = driver
+            for locator in self.locators[:-1]:
+                container = container.find_element(*locator)
+            items = container.find_elements(*self.locators[-1])
+        except (NoSuchElementException, StaleElementReferenceException):
+            return False
+        return items or False
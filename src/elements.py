@@ -2,6 +2,7 @@
 import re
 import time
 
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
@@ -9,10 +10,16 @@ from selenium.webdriver.support import expected_conditions as EC
 
 from locators import ConfigLocators as CL
 from locators import WebScrapingLocators as WSL
+from conditions import text_changed_from, elements_rerendered
+from scripts import ConfigScripts as CS
+from scripts import WebScrapingScripts as WSS
+from records import JobRecord
 
 
 # CL = ConfigLocators
 # WSL = WebScrapingLocators
+# CS = ConfigScripts
+# WSS = WebScrapingScripts
 
 
 class ConfigElements:
@@ -128,11 +135,15 @@ class ConfigElements:
                 > company size
                 > sortby
             
+        - get salary bins (one execute_async_script round trip)
+        - open normalized salary filter
         - initialize salary bins
-        - move slider function
+        - move slider function (one batched send_keys)
+        - verify sliders (one header read)
         - click more dropdown n_clicks times
         - initialize a filter
         - change filter to function
+        - get filter texts (one execute_async_script round trip)
         - initialize sortby filter
         - regex parse salary
         - reset salary base function
@@ -142,6 +153,11 @@ class ConfigElements:
     # Tunable parameter.
     seconds_before_timeout = 10
     
+    # Tunable parameters for the scripted filter walk (the ceiling for
+    # a dropdown to show and the polling interval, in seconds).
+    seconds_before_dropdown_timeout = 2
+    dropdown_poll_frequency = 0.05
+    
     
     
     # ==================================================
@@ -565,12 +581,23 @@ class ConfigElements:
     
     
     
-    # Initializes the possible salary bins for filter minsalary.
-    def initialize_salary_bins(self):
-        # Glassdoor.com seems to have different salary ranges 
-        # each time the job page is loaded in. To compensate,
-        # the apply button under the salary filter is clicked
-        # so that the correct salary ranges are displayed.
+    # Reads every salary bin in one scripted call (see ConfigScripts.SALARY_BINS);
+    # the salary dropdown must be open. Returns the left and right slider bins
+    # like initialize_salary_bins(), or None if the script can't move the slider.
+    def get_salary_bins_script(self):
+        all_bins = self.driver.execute_async_script(CS.SALARY_BINS, CS.SALARY_BINS_LOCATORS)
+        if not all_bins:
+            return None
+        return all_bins[:-1], all_bins[1:]
+    
+    
+    # Glassdoor.com seems to have different salary ranges 
+    # each time the job page is loaded in. To compensate,
+    # the apply button under the salary filter is clicked
+    # so that the correct salary ranges are displayed.
+    # Expects the salary dropdown open; returns the salary 
+    # filter with its dropdown open again and both sliders reset.
+    def open_normalized_salary_filter(self):
         salary_filter_applybutton = self.get_filters_minsalaries_applybutton()
         salary_filter_applybutton.click()
                 
@@ -580,6 +607,27 @@ class ConfigElements:
                 
         salary_filter = self.get_filters_minsalaries()
         salary_filter.click()
+        return salary_filter
+    
+    
+    # Initializes the possible salary bins for filter minsalary.
+    # If use_script is True, the bins are read in one scripted call 
+    # first; the key by key walk below is the fallback. Both read
+    # the normalized salary ranges (see open_normalized_salary_filter).
+    def initialize_salary_bins(self, use_script=True):
+        salary_filter = self.open_normalized_salary_filter()
+        
+        if use_script:
+            try:
+                salary_bins = self.get_salary_bins_script()
+            except WebDriverException:
+                # The script may have left the sliders moved.
+                salary_bins = None
+                salary_filter = self.open_normalized_salary_filter()
+            if salary_bins is not None:
+                # Close the dropdown without applying the moved sliders.
+                salary_filter.click()
+                return salary_bins
         
         # Get all histogram bins into a list.
         histogram_bins = self.get_primary_dropdown_histogram_container_all_div()
@@ -629,13 +677,31 @@ class ConfigElements:
     
     
     # Moves left and right sliders for filter minsalary.
+    # All key presses are sent in one batched send_keys call.
     def move_slider(self, slider, idx, current_idx, difference):
         if idx < current_idx:
-            for _ in range(difference):
-                slider.send_keys(Keys.ARROW_LEFT)
+            slider.send_keys(Keys.ARROW_LEFT * difference)
         elif idx > current_idx:
-            for _ in range(difference):
-                slider.send_keys(Keys.ARROW_RIGHT)
+            slider.send_keys(Keys.ARROW_RIGHT * difference)
+    
+    
+    # Checks both sliders with one header read and moves any slider 
+    # that isn't on its target bin (e.g. after a dropped key press).
+    # Returns True if both sliders were already on target.
+    def verify_sliders(self, begin_salary_idx, end_salary_idx):
+        a_bin = self.regex_parse_salary(self.get_histogram_labels_header())
+        is_on_target = True
+        for get_slider, salaries, idx, endpoint in [
+            (self.get_left_slider, self.filters["salaries"]["left_slider"], begin_salary_idx, 0),
+            (self.get_right_slider, self.filters["salaries"]["right_slider"], end_salary_idx, 1)
+        ]:
+            current_idx = salaries.index(a_bin[endpoint])
+            if current_idx != idx:
+                is_on_target = False
+                slider = get_slider()
+                slider.click()
+                self.move_slider(slider, idx, current_idx, abs(idx - current_idx))
+        return is_on_target
     
     
     # Because the more dropdown filters don't close properly, this small
@@ -712,12 +778,11 @@ class ConfigElements:
                     
             # Special initialization for is_salary.
             elif is_salary:
-                self.filters[name] = {}
                 salary_filter = get_filters_()
                 salary_filter.click()
                 left_slider_bins, right_slider_bins = self.initialize_salary_bins()
-                self.filters[name]["left_slider"] = left_slider_bins
-                self.filters[name]["right_slider"] = right_slider_bins
+                self.filters[name] = {"left_slider": left_slider_bins,
+                                      "right_slider": right_slider_bins}
                 
         # Glassdoor.com occassionally might exclude a filter or two 
         # from the "More" dropdown. This except block catches it and 
@@ -731,6 +796,14 @@ class ConfigElements:
     # Note: change_filter_to only applies to filters
     # in the self.get_join_filters attribute.
     def change_filter_to(self, name, choice, is_more=False):
+        # Reading the options re-reads the filter first if an earlier change
+        # invalidated it (see LazyFilters). Cached options (see FilterCache)
+        # may also be out of date, so the filter is re-read if choice isn't
+        # one of them.
+        options = self.filters.get(name, [])
+        if self.filter_cache is not None and choice not in options:
+            self.init_filters(name, refresh=True)
+        
         try:
             if is_more:
                 self.click_more_dropdown()
@@ -749,6 +822,26 @@ class ConfigElements:
                 self.click_more_dropdown(n_clicks=2)
         except:
             print(f"Cannot change filter {name}.")
+        self.filters.mark_changed()
+    
+    
+    # Reads the dropdown text of the named filters of get_join_filters
+    # (salaries excluded) and of sortby if read_sortby, all in one scripted
+    # walk (see ConfigScripts.FILTER_TEXTS) instead of a click, read and 
+    # close per filter. Returns {name: text} of the filters that showed;
+    # the texts go through get_and_parse_filters() like init_filter()'s.
+    def get_filter_texts_script(self, names, read_sortby=True):
+        filters = [[name, CS.FILTER_LOCATORS[name], self.get_join_filters[name]["is_more"]]
+                   for name in names]
+        options = {
+            "read_sortby": read_sortby,
+            "timeout_ms": int(self.seconds_before_dropdown_timeout * 1000),
+            "poll_ms": int(self.dropdown_poll_frequency * 1000)
+        }
+        return self.driver.execute_async_script(CS.FILTER_TEXTS, 
+                                                CS.FILTER_TEXTS_LOCATORS, 
+                                                filters, 
+                                                options) or {}
     
     
     # Initialize the "Most Relevant" dropdown "filter".
@@ -773,18 +866,20 @@ class ConfigElements:
         a_bin = self.get_histogram_labels_header()
         a_bin = self.regex_parse_salary(a_bin)
         
-        # Basically, keep a moving variable
-        # one trails the other and the loop
-        # breaks if the 2 variables are equal to each other 
-        # meaning the end of the salary range has been hit by that
-        # specific slider.
+        # A slider is never more than one key press per histogram bar
+        # from its edge, so enough presses to reach the edge are sent in
+        # one batch. Basically, keep a moving variable: one trails the 
+        # other and the loop breaks if the 2 variables are equal to each 
+        # other meaning the end of the salary range has been hit by that
+        # specific slider (normally after the first batch).
+        n_keys = len(self.get_primary_dropdown_histogram_container_all_div())
         before = a_bin[idx]
         slider.click()
-        slider.send_keys(key_fn)
+        slider.send_keys(key_fn * n_keys)
         current = self.regex_parse_salary(self.get_histogram_labels_header())[idx]
         while current != before:
             before = current
-            slider.send_keys(key_fn)
+            slider.send_keys(key_fn * n_keys)
             current = self.regex_parse_salary(self.get_histogram_labels_header())[idx]
         if not is_both:
             applybutton = self.get_filters_minsalaries_applybutton()
@@ -804,13 +899,30 @@ class WebScrapingElements:
     
     - Wait Base Function
     
+    - Readiness Waits
+    
+        - wait until *
+            > stale
+            > listing ready (JD_COL changed)
+            > page ready (MainCol list re-rendered)
+            
+        - load page (the old page is the staleness anchor)
+    
+    - Absence Probes
+    
+        - probe element
+        
     - Pop-up
         
         - pop-up close button
+        - probe pop-up close button
+        - install pop-up observer
+        - get pop-up dismissals
         
     - Get Joblistings
     
         - get joblistings list
+        - get joblisting cards (one execute_script round trip)
         - page navigator
         - get page count
         
@@ -818,21 +930,137 @@ class WebScrapingElements:
     
         - get jdcol
         - get try again button
+        - probe try again button
         - get job info *
             > 1
             > 2
             > 3
             > 4
+            > texts (all 4 groups, one WebElement read at a time)
+            > script (all 4 groups, one execute_script round trip)
+        - get jdcol html
+        
+    - Detail Tabs
+    
+        - open tab (optionally prepared before it loads)
+        - close tab
+    
+    - Parse Job Info
+    
+        - parse job info
     
     """
     
     seconds_before_timeout = 5
     
+    # Tunable parameters (ceilings for the readiness waits, in seconds).
+    # These replace the fixed time.sleep() calls in scrape_jobs: a wait
+    # returns as soon as its signal fires and only uses the whole ceiling
+    # when the page is genuinely slow.
+    seconds_before_listing_timeout = 10
+    seconds_before_popup_timeout = 2
+    seconds_before_page_timeout = 15
+    poll_frequency = 0.1
+    
     def wait_until_element(self, locator, seconds_before_timeout=seconds_before_timeout):
         return WebDriverWait(self.driver, seconds_before_timeout).until(
                 EC.presence_of_element_located(locator)
             )
     
+    
+    
+    # ==================================================
+    # Readiness Waits
+    # ==================================================
+    
+    
+    
+    # Waits until element is detached from the DOM (e.g. a closed pop-up
+    # or the old JD_COL after a new joblisting is clicked).
+    # Returns False instead of raising if the ceiling is hit.
+    def wait_until_stale(self, element, seconds_before_timeout=None):
+        if seconds_before_timeout is None:
+            seconds_before_timeout = self.seconds_before_popup_timeout
+        try:
+            return WebDriverWait(self.driver, 
+                                 seconds_before_timeout, 
+                                 poll_frequency=self.poll_frequency).until(
+                       EC.staleness_of(element)
+                   )
+        except TimeoutException:
+            return False
+    
+    
+    # Waits until the JD_COL text differs from previous_text, i.e. the
+    # clicked joblisting has been rendered in the job description column.
+    # Returns the new JD_COL text, or None if the ceiling is hit.
+    def wait_until_listing_ready(self, previous_text=None):
+        try:
+            return WebDriverWait(self.driver, 
+                                 self.seconds_before_listing_timeout, 
+                                 poll_frequency=self.poll_frequency).until(
+                       text_changed_from(WSL.JD_COL, previous_text)
+                   )
+        except TimeoutException:
+            return None
+    
+    
+    # Waits until the MainCol joblistings list has been re-rendered after
+    # pagination (previous_listing goes stale and new li are present).
+    # Returns the new joblistings, or an empty list if the ceiling is hit.
+    def wait_until_page_ready(self, previous_listing=None):
+        try:
+            return WebDriverWait(self.driver, 
+                                 self.seconds_before_page_timeout, 
+                                 poll_frequency=self.poll_frequency).until(
+                       elements_rerendered([WSL.MAIN_COL, 
+                                            WSL.JOBLISTING_CONTAINER, 
+                                            WSL.JOBLISTINGS], 
+                                           previous_listing)
+                   )
+        except TimeoutException:
+            return []
+    
+    
+    # Opens URL and waits until its joblistings are rendered. Unless the
+    # page load strategy is normal, driver.get() can return before the
+    # navigation commits, so the old page's <html> is waited on to go 
+    # stale (else the old page's joblistings pass for the new ones).
+    # Returns the new joblistings, or an empty list if the ceiling is hit.
+    def load_page(self, URL):
+        try:
+            previous_html = self.driver.find_element(By.TAG_NAME, "html")
+        except WebDriverException:
+            previous_html = None
+        self.driver.get(URL)
+        return self.wait_until_page_ready(previous_html)
+    
+    
+    
+    # __________________________________________________
+    
+    
+    
+    # ==================================================
+    # Absence Probes
+    # ==================================================
+    
+    
+    
+    # Returns the element found by walking locators from the page (like
+    # the getters below) if it is there right now, else None.
+    # This never waits: it is a single execute_script round trip, so 
+    # checking for an optional element (a pop-up, an error banner, 
+    # EmpBasicInfo) costs nothing extra when the element is absent.
+    def probe_element(self, *locators):
+        return self.driver.execute_script(WSS.PROBE, [list(locator) for locator in locators])
+    
+    
+    
+    # __________________________________________________
+    
+    
+    
     # ==================================================
     # Pop-up
     # ==================================================
@@ -841,6 +1069,22 @@ class WebScrapingElements:
     
     def close_popup(self):
         return self.wait_until_element(WSL.POPUP_CLOSE_BTN)
+    
+    
+    def probe_popup(self):
+        return self.probe_element(WSL.POPUP_CLOSE_BTN)
+    
+    
+    # Injects a page-level observer that dismisses the pop-up as soon as
+    # it appears. Must be called once per page load (it is a no-op if the
+    # observer is already installed on the current page).
+    def install_popup_observer(self):
+        return self.driver.execute_script(WSS.POPUP_OBSERVER, WSS.POPUP_OBSERVER_LOCATORS)
+    
+    
+    # The number of pop-ups the observer has dismissed in this tab.
+    def get_popup_dismissals(self):
+        return self.driver.execute_script(WSS.POPUP_DISMISSALS)
         
         
     # __________________________________________________
@@ -859,6 +1103,12 @@ class WebScrapingElements:
         return joblisting_container.find_elements(*WSL.JOBLISTINGS)
     
     
+    # Gets the card summary of every joblisting on the page in a single
+    # execute_script round trip (no clicks). Missing fields are None.
+    def get_joblisting_cards(self):
+        return self.driver.execute_script(WSS.CARDS, WSS.CARDS_LOCATORS) or []
+    
+    
     def get_page_nav(self):
         footer_page_nav = self.wait_until_element(WSL.FOOTER_PAGE_NAV)
         pages_container = footer_page_nav.find_element(*WSL.PAGES_CONTAINER)
@@ -892,6 +1142,10 @@ class WebScrapingElements:
         return try_again_div.find_element(*WSL.TRY_AGAIN_BTN)
     
     
+    def probe_try_again_btn(self):
+        return self.probe_element(WSL.JD_COL, WSL.TRY_AGAIN_DIV, WSL.TRY_AGAIN_BTN)
+    
+    
     def get_jobinfo1(self):
         jd_col = self.get_jdcol()
         header = jd_col.find_element(*WSL.HEADER)
@@ -917,6 +1171,152 @@ class WebScrapingElements:
         return job_desc_container.find_element(*WSL.JOB_INFO_4)
     
     
+    # Gets the raw text of job info 1-4 through the getters above.
+    # This costs a WebDriver call per find and per .text read.
+    def get_jobinfo_texts(self):
+        jobinfo_texts = {}
+        try:
+            jobinfo1 = self.get_jobinfo1()[:4]
+            jobinfo_texts["jobinfo1"] = [element.text for element in jobinfo1]
+        except:
+            jobinfo_texts["jobinfo1"] = []
+        try:
+            jobinfo2 = self.get_jobinfo2()[:1]
+            jobinfo_texts["jobinfo2"] = [element.text for element in jobinfo2]
+        except:
+            jobinfo_texts["jobinfo2"] = []
+        # EmpBasicInfo is optional, so probe for it rather than wait.
+        try:
+            jobinfo3 = self.probe_element(WSL.EMP_BASIC_INFO, WSL.COMP_OVERVIEW_CONTAINER)
+            jobinfo_texts["jobinfo3"] = jobinfo3.text if jobinfo3 is not None else None
+        except:
+            jobinfo_texts["jobinfo3"] = None
+        try:
+            jobinfo_texts["jobinfo4"] = self.get_jobinfo4().text
+        except:
+            jobinfo_texts["jobinfo4"] = None
+        return jobinfo_texts
+    
+    
+    # Gets the same raw text as get_jobinfo_texts() in a single 
+    # execute_script round trip. Returns None if there is no JD_COL.
+    def get_jobinfo_script(self):
+        return self.driver.execute_script(WSS.JOBINFO, WSS.JOBINFO_LOCATORS)
+    
+    
+    # Gets the outerHTML of JD_COL (None if there is none) for capture mode.
+    def get_jdcol_html(self):
+        return self.driver.execute_script(WSS.JDCOL_HTML, WSS.JDCOL_HTML_LOCATORS)
+    
+    
+    
+    # __________________________________________________
+    
+    
+    
+    # ==================================================
+    # Detail Tabs
+    # ==================================================
+    
+    
+    
+    # Opens URL in a new tab without switching to it, so that it loads 
+    # while the driver works in other tabs. Returns the new window handle,
+    # or None if no tab was opened.
+    # If prepare (a function of the driver, e.g. LaunchProfile.prepare) is 
+    # given, the tab is opened blank and prepared before URL starts loading,
+    # since DevTools settings only apply to the tab they were set in.
+    def open_tab(self, URL, prepare=None):
+        handles = self.driver.window_handles
+        self.driver.execute_script(WSS.OPEN_TAB, URL if prepare is None else "about:blank")
+        new_handles = [handle for handle in self.driver.window_handles if handle not in handles]
+        if not new_handles:
+            return None
+        
+        if prepare is not None:
+            current_handle = self.driver.current_window_handle
+            self.driver.switch_to.window(new_handles[0])
+            prepare(self.driver)
+            self.driver.execute_script(WSS.NAVIGATE, URL)
+            self.driver.switch_to.window(current_handle)
+        return new_handles[0]
+    
+    
+    # Closes the tab handle. The driver has no current window afterwards
+    # until it is switched to another one.
+    def close_tab(self, handle):
+        self.driver.switch_to.window(handle)
+        self.driver.close()
+    
+    
         
     # __________________________________________________
     
+    
+    
+    # ==================================================
+    # Parse Job Info
+    # ==================================================
+    
+    
+    
+    def parse_jobinfo(self, jobinfo_texts):
+        """Parses the raw text of job info 1-4 into a single job record.
+        
+        Parameters
+        ----------
+        jobinfo_texts : dict
+            The output of get_jobinfo_texts() or get_jobinfo_script():
+            "jobinfo1" and "jobinfo2" are lists of strings, "jobinfo3"
+            and "jobinfo4" are strings (or None if missing).
+            
+        Returns
+        -------
+        type
+            JobRecord
+        describe
+            A JobRecord with the job info 1-4 features. Missing features are None.
+        
+        Examples
+        --------
+        input : {"jobinfo1": ["Acme", "Data Scientist"], "jobinfo2": [],
+                 "jobinfo3": "Size\n51 to 200 Employees", "jobinfo4": None}
+        output : JobRecord(company="Acme", job_title="Data Scientist", 
+                           headquarters=None, ..., size="51 to 200 employees", ...)
+                  
+        """
+        jobinfo1 = jobinfo_texts.get("jobinfo1") or []
+        jobinfo2 = jobinfo_texts.get("jobinfo2") or []
+        jobinfo3 = jobinfo_texts.get("jobinfo3")
+        jobinfo4 = jobinfo_texts.get("jobinfo4")
+        
+        # Job Info I.
+        jobinfo1 = jobinfo1 + [None] * (4 - len(jobinfo1))
+        record = JobRecord(company=jobinfo1[0],
+                           job_title=jobinfo1[1],
+                           headquarters=jobinfo1[2],
+                           salary_estimate=jobinfo1[3])
+        
+        # Job Info II.
+        record.job_type = jobinfo2[0] if jobinfo2 else None
+        
+        # Job Info III.
+        # The text is a string, split by "\n", it will 
+        # be a list with every value an attribute and every other
+        # value corresponding to a value. Only the known features
+        # (size, founded, type, industry, sector, revenue) are kept.
+        if jobinfo3:
+            features_list = jobinfo3.lower().split("\n")
+            for i in range(0, len(features_list)-1, 2):
+                if features_list[i] in JobRecord.JOBINFO3_FEATURES:
+                    setattr(record, JobRecord.FEATURES[features_list[i]], features_list[i + 1])
+        
+        # Job Info IV.
+        record.job_description = jobinfo4
+        
+        return record
+    
+    
+    
+    # __________________________________________________
+    
@@ -0,0 +1,74 @@
+
+import json
+import time
+import sqlite3
+
+from urllib.parse import urlsplit, parse_qsl
+
+
+class FilterCache:
+    """FilterCache is a persistent cache of the filter options found by
+    init_filters(), so that later sessions of the same query don't have to
+    open every dropdown and walk the salary slider again.
+
+    Options are cached per query and per filter. A query is keyed by its
+    URL (see cache_key()): keyword, location and every active filter,
+    since the options of a filter change when other filters are updated.
+    Each filter is cached with the time it was read and is stale after
+    ttl seconds.
+
+    Note: the counts of dict filters are the counts at the time the
+    filter was read.
+    
+    
+    Functions:
+
+    cache_key(URL)
+        Returns the key of the query of a URL.
+
+    get(key, name)
+        Returns the cached options of a filter, or None if missing or stale.
+
+    put(key, name, options)
+        Caches the options of a filter.
+
+    close()
+        Closes the cache.
+
+    """
+
+    def __init__(self, path, ttl=24 * 60 * 60):
+        self.ttl = ttl
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS filters "
+                                "(key TEXT, name TEXT, saved_at REAL, options TEXT, "
+                                "PRIMARY KEY (key, name)) WITHOUT ROWID")
+        self.connection.commit()
+    
+    
+    # The sorted query parameters of URL without the page number, e.g.
+    # "fromAge=-1&...&sc.keyword=data scientist".
+    @staticmethod
+    def cache_key(URL):
+        params = [(name, value.strip()) for name, value in parse_qsl(urlsplit(URL).query,
+                                                                     keep_blank_values=True)
+                  if name != "p"]
+        return "&".join(f"{name}={value}" for name, value in sorted(params))
+    
+    
+    def get(self, key, name):
+        row = self.connection.execute("SELECT saved_at, options FROM filters "
+                                      "WHERE key = ? AND name = ?", (key, name)).fetchone()
+        if row is None or time.time() - row[0] > self.ttl:
+            return None
+        return json.loads(row[1])
+    
+    
+    def put(self, key, name, options):
+        self.connection.execute("INSERT OR REPLACE INTO filters (key, name, saved_at, options) "
+                                "VALUES (?, ?, ?, ?)", (key, name, time.time(), json.dumps(options)))
+        self.connection.commit()
+    
+    
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,177 @@
+
+"""Compiles a declarative filter spec into a Glassdoor query URL.
+
+Every filter of the job search is a query parameter of the URL (see
+GlassdoorWebScraper.URL_part_2), so a whole set of filters can be applied
+with a single driver.get() instead of clicking through each dropdown,
+the More dropdown and the salary sliders.
+
+A spec is a dict keyed by the filter names of get_join_filters (plus a
+few extra filters); values are the option names produced by the
+join_filters_* functions, e.g.
+
+    {"jobtypes": "full_time",
+     "postdates": "last_week",
+     "salaries": ("75K", "150K"),
+     "radii": "25_miles",
+     "seniority_labels": "entry_level",
+     "company_sizes": "1_50_employees",
+     "ratings": 4,
+     "easy_apply_only": True}
+
+cityids, industries, job_functions and companies are Glassdoor ids
+(cityId, industryId, sgocId and companyId), which cannot be derived from
+their option names; they must be given as ints.
+
+Functions:
+
+    compile_filters_URL(URL, spec, filters=None)
+        Returns URL with the filters of spec applied.
+
+"""
+
+import re
+
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+# The employerSizes value of each company size, by its smallest size.
+COMPANY_SIZE_LOWER_BOUNDS = [1, 51, 201, 501, 1001, 5001, 10000]
+
+POSTDATE_UNIT_DAYS = {"day": 1, "week": 7, "month": 30}
+
+SORTBY_VALUES = {
+    "most_relevant": "relevance",
+    "most_recent": "date_desc"
+}
+
+
+# An option name such as "all_job_types" is the dropdown's default.
+def is_default(option):
+    return option.startswith("all")
+
+
+def jobtype_value(option):
+    return "all" if is_default(option) else option.replace("_", "")
+
+
+# "last_day" -> 1, "last_3_days" -> 3, "last_2_weeks" -> 14.
+def postdate_value(option):
+    match = re.search(r"(?:(\d+)_)?(day|week|month)", option)
+    if match is None:
+        return -1
+    return int(match.group(1) or 1) * POSTDATE_UNIT_DAYS[match.group(2)]
+
+
+def radius_value(option):
+    match = re.search(r"\d+", option)
+    return int(match.group()) if match else 0
+
+
+# "125K" -> 125000.
+def salary_value(salary):
+    if isinstance(salary, int):
+        return salary
+    match = re.fullmatch(r"\$?(\d+(?:\.\d+)?)([KM]?)\+?", salary.strip().upper())
+    if match is None:
+        raise ValueError(f"Cannot parse salary {salary}.")
+    return round(float(match.group(1)) * {"": 1, "K": 1_000, "M": 1_000_000}[match.group(2)])
+
+
+# "mid-senior_level" -> "midseniorlevel".
+def seniority_value(option):
+    return "all" if is_default(option) else re.sub("[_-]", "", option)
+
+
+# "1_to_50_employees" -> 1, "5001_to_10000_employees" -> 6,
+# "10000_employees" (10000+) -> 7.
+def companysize_value(option):
+    match = re.search(r"\d+", option)
+    if is_default(option) or match is None:
+        return 0
+    lower_bound = int(match.group())
+    return sum(lower_bound >= bound for bound in COMPANY_SIZE_LOWER_BOUNDS)
+
+
+def id_value(name):
+    def value(option):
+        if isinstance(option, bool) or not isinstance(option, int):
+            raise ValueError(f"Filter {name} takes a Glassdoor id (an int), not {option!r}.")
+        return option
+    return value
+
+
+# The query parameter(s) of each filter of a spec and how an option
+# maps to its value.
+FILTER_PARAMETERS = {
+    "jobtypes": ("jobType", jobtype_value),
+    "postdates": ("fromAge", postdate_value),
+    "radii": ("radius", radius_value),
+    "cityids": ("cityId", id_value("cityids")),
+    "industries": ("industryId", id_value("industries")),
+    "job_functions": ("sgocId", id_value("job_functions")),
+    "seniority_labels": ("seniorityType", seniority_value),
+    "companies": ("companyId", id_value("companies")),
+    "company_sizes": ("employerSizes", companysize_value),
+    "ratings": ("minRating", lambda rating: f"{float(rating):.1f}"),
+    "include_no_salary": ("includeNoSalaryJobs", lambda include: str(bool(include)).lower()),
+    "easy_apply_only": ("applicationType", lambda is_eao: int(bool(is_eao))),
+    "work_from_home_only": ("remoteWorkType", lambda is_wfho: int(bool(is_wfho))),
+    "sortbys": ("sortBy", lambda sort_type: SORTBY_VALUES[sort_type])
+}
+
+
+def compile_filters_URL(URL, spec, filters=None):
+    """Returns URL with every filter of spec set as a query parameter.
+
+    Parameters
+    ----------
+    URL : str
+        The query URL to apply the filters to (parameters not in spec
+        are kept as they are).
+    spec : dict
+        The filters to apply, keyed by filter name (see the module
+        docstring). "salaries" is a (begin_salary, end_salary) pair like
+        change_salary_to() takes; "keyword" replaces the search keyword.
+    filters : dict, optional
+        A GlassdoorWebScraper's filters. If given, option names are checked
+        against the options found by init_filters().
+
+    Returns
+    -------
+    type
+        str
+    describe
+        The URL of page 1 of the filtered query.
+
+    Examples
+    --------
+    input : URL, {"jobtypes": "full_time", "postdates": "last_week"}
+    output : URL with jobType=fulltime and fromAge=7
+
+    """
+    filters = filters or {}
+    scheme, netloc, path, query, fragment = urlsplit(URL)
+    params = {name: value.strip() for name, value in parse_qsl(query, keep_blank_values=True)}
+
+    # Any page number no longer applies.
+    params.pop("p", None)
+
+    for name, option in spec.items():
+        options = filters.get(name)
+        if isinstance(option, str) and isinstance(options, (dict, list)) and option not in options:
+            raise ValueError(f"Unknown option {option} for filter {name}.")
+
+        if name == "keyword":
+            params["sc.keyword"] = option
+        elif name == "salaries":
+            begin_salary, end_salary = option
+            params["minSalary"] = salary_value(begin_salary)
+            params["maxSalary"] = salary_value(end_salary)
+        elif name in FILTER_PARAMETERS:
+            parameter, value = FILTER_PARAMETERS[name]
+            params[parameter] = value(option)
+        else:
+            raise ValueError(f"Unknown filter {name}.")
+
+    return urlunsplit((scheme, netloc, path, urlencode(params), fragment))
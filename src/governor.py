@@ -0,0 +1,115 @@
+
+import time
+import threading
+
+
+class RateGovernor:
+    """RateGovernor paces clicks with a token bucket whose rate adapts to
+    how the site is responding (AIMD: additive increase, multiplicative
+    decrease).
+
+    Every joblisting click and page turn first takes a token (acquire()).
+    Each cleanly rendered joblisting adds increase to the rate (up to
+    max_rate); each try again banner, pop-up or readiness timeout
+    multiplies the rate by that event's decrease factor (down to min_rate).
+    So pacing speeds up on good days and backs off as soon as the site
+    starts pushing back.
+
+    The state is guarded by a lock; GOVERNOR (below) is the instance
+    shared by every GlassdoorWebScraper in the process.
+
+
+    Parameters
+    ----------
+    rate : float
+        The starting rate in tokens (clicks) per second.
+    min_rate, max_rate : float
+        The bounds of the rate.
+    burst : float
+        The bucket size, i.e. how many clicks can go through back to back.
+    increase : float
+        Added to the rate on every success.
+    decreases : dict
+        The factor the rate is multiplied by for each kind of error.
+    
+    
+    Functions:
+
+    acquire()
+        Blocks until a click is allowed.
+
+    record_success()
+        Additively increases the rate.
+
+    record_error(kind, n=1)
+        Multiplicatively decreases the rate.
+
+    stats()
+        Returns the event counts and the current rate.
+
+    """
+
+    def __init__(self,
+                 rate=1.0,
+                 min_rate=0.1,
+                 max_rate=5.0,
+                 burst=2.0,
+                 increase=0.05,
+                 decreases=None):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decreases = decreases or {"try_again": 0.5, "timeout": 0.5, "popup": 0.8}
+
+        self.tokens = burst
+        self.last_refill = time.monotonic()
+        self.counts = {"success": 0}
+        self.lock = threading.Lock()
+    
+    
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+    
+    
+    # Blocks until a token is available and takes it.
+    # Sleeps outside the lock so other scrapers aren't held up.
+    def acquire(self):
+        while True:
+            with self.lock:
+                self.refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+    
+    
+    # Tokens accrued so far are credited at the old rate before the 
+    # rate changes (as in record_error()).
+    def record_success(self):
+        with self.lock:
+            self.refill()
+            self.rate = min(self.max_rate, self.rate + self.increase)
+            self.counts["success"] += 1
+    
+    
+    # kind is one of the keys of self.decreases.
+    def record_error(self, kind, n=1):
+        with self.lock:
+            self.refill()
+            self.rate = max(self.min_rate, self.rate * self.decreases[kind] ** n)
+            self.counts[kind] = self.counts.get(kind, 0) + n
+    
+    
+    def stats(self):
+        with self.lock:
+            return dict(self.counts, rate=self.rate)
+
+
+
+# The governor shared by every GlassdoorWebScraper in the process.
+GOVERNOR = RateGovernor()
@@ -0,0 +1,187 @@
+
+import os
+import json
+
+from filter_cache import FilterCache
+
+
+class ScrapeJournal:
+    """ScrapeJournal is an append-only, on-disk checkpoint for long scrapes.
+
+    Every line of the journal file is a JSON object with an "event" key:
+
+        - {"event": "query", "query": {...}}
+            The query (keyword, URL, current_url and filters) being scraped.
+            A new query starts a new section; only the last section counts.
+        - {"event": "begin", "page": n}
+            Page n is (re)started. Jobs of an earlier, uncommitted attempt
+            at a page are dropped.
+        - {"event": "job", "page": n, "job": {...}}
+            A scraped job on page n.
+        - {"event": "page", "page": n}
+            Page n is complete. Jobs on a page only count once their page
+            is committed, so a page that was cut off part way (by a crash or
+            by stopping at n_jobs) is scraped again from its first joblisting
+            on resume without duplicates.
+
+    Jobs are flushed as they are written and every page commit is
+    fsync'ed, so a crash loses at most the uncommitted page. A torn
+    last line (a crash mid-write) is ignored on load.
+    
+    
+    Functions:
+
+    load()
+        Reads the journal and returns the state of the last query section.
+
+    matches(query, state=None)
+        Checks if the last query section is for query.
+
+    begin_query(query)
+        Starts a new query section.
+
+    begin_page(page)
+        Marks the start of a page.
+
+    record_job(page, job)
+        Appends a scraped job.
+
+    commit_page(page)
+        Marks a page as complete.
+
+    committed_jobs()
+        Yields the jobs of committed pages of the last query section.
+
+    close()
+        Closes the journal file.
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+    
+    
+    # Yields every event of the journal file, skipping a torn line.
+    def read_events(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    pass
+    
+    
+    # Replays the events of the journal, yielding ("query", query) for 
+    # every query and ("page", page, jobs) for every committed page with
+    # the jobs of its last attempt. Jobs recorded before a page is begun
+    # again, or for a page that is already committed, are dropped.
+    def replay(self):
+        page_counter, pending = 0, []
+        for event in self.read_events():
+            if event["event"] == "query":
+                page_counter, pending = 0, []
+                yield "query", event["query"]
+            elif event["event"] == "begin":
+                pending = []
+            elif event["event"] == "job":
+                if event["page"] > page_counter:
+                    pending.append(event)
+            elif event["event"] == "page":
+                page_counter = event["page"]
+                yield "page", page_counter, [job_event["job"] for job_event in pending 
+                                             if job_event["page"] == page_counter]
+                pending = []
+    
+    
+    def load(self):
+        """Reads the journal and returns the state of the last query section.
+
+        Returns
+        -------
+        type
+            dict
+        describe
+            "query" is the last query (None if the journal is empty),
+            "page_counter" is the last committed page (0 if none) and
+            "n_jobs" is the number of jobs on committed pages.
+
+        """
+        state = {"query": None, "page_counter": 0, "n_jobs": 0}
+        for event in self.replay():
+            if event[0] == "query":
+                state = {"query": event[1], "page_counter": 0, "n_jobs": 0}
+            else:
+                state["page_counter"] = event[1]
+                state["n_jobs"] += len(event[2])
+        return state
+    
+    
+    # A journal section matches a query when the keyword, the base URL
+    # and the filters of current_url (ignoring the page number, see 
+    # FilterCache.cache_key) agree, so a run with other filters starts 
+    # a new section instead of resuming the old one.
+    def matches(self, query, state=None):
+        if state is None:
+            state = self.load()
+        last_query = state["query"]
+        if last_query is None:
+            return False
+        return (all(last_query.get(key) == query.get(key) for key in ["keyword", "URL"])
+                and FilterCache.cache_key(last_query.get("current_url") or "") 
+                    == FilterCache.cache_key(query.get("current_url") or ""))
+    
+    
+    def ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    
+    
+    def write_event(self, event, sync=False):
+        if self.file is None:
+            self.file = open(self.path, "a", encoding="utf-8")
+            
+            # Terminate a torn last line so it doesn't swallow this event.
+            if self.file.tell() and not self.ends_with_newline():
+                self.file.write("\n")
+        self.file.write(json.dumps(event) + "\n")
+        self.file.flush()
+        if sync:
+            os.fsync(self.file.fileno())
+    
+    
+    def begin_query(self, query):
+        self.write_event({"event": "query", "query": query}, sync=True)
+    
+    
+    def begin_page(self, page):
+        self.write_event({"event": "begin", "page": page})
+    
+    
+    # job is a dict or a JobRecord (saved as a dict).
+    def record_job(self, page, job):
+        self.write_event({"event": "job", "page": page, "job": dict(job)})
+    
+    
+    def commit_page(self, page):
+        self.write_event({"event": "page", "page": page}, sync=True)
+    
+    
+    def committed_jobs(self):
+        n_queries = sum(event["event"] == "query" for event in self.read_events())
+        
+        query_idx = 0
+        for event in self.replay():
+            if event[0] == "query":
+                query_idx += 1
+            elif query_idx == n_queries:
+                yield from event[2]
+    
+    
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,103 @@
+
+from selenium import webdriver
+
+
+# Injected into every document when disable_animations is True.
+# Durations are near zero rather than none so that transitionend and
+# animationend still fire for components that wait on them.
+NO_ANIMATIONS_SCRIPT = """
+(function () {
+    var style = document.createElement("style");
+    style.textContent = "*, *::before, *::after {" +
+        "animation-duration: 0.01ms !important; animation-delay: 0s !important;" +
+        "transition-duration: 0.01ms !important; transition-delay: 0s !important;" +
+        "scroll-behavior: auto !important; }";
+    function add() { (document.head || document.documentElement).appendChild(style); }
+    if (document.documentElement) { add(); } else { document.addEventListener("DOMContentLoaded", add); }
+})();
+"""
+
+
+class LaunchProfile:
+    """LaunchProfile describes how GlassdoorWebScraper.get() (and a
+    SessionPool) launches Chrome.
+
+    The default profile is the original launch: a windowed, maximized
+    Chrome that waits for every page to fully load. LEAN (below) is headless,
+    returns from navigation at DOMContentLoaded (the scraper's readiness
+    waits take over from there), blocks images, media and fonts, and makes
+    CSS animations and transitions instant so that dropdowns and sliders
+    settle immediately.
+    
+    
+    Parameters
+    ----------
+    headless : bool
+        Runs Chrome without a window (at window_size).
+    page_load_strategy : str
+        "normal", "eager" (return at DOMContentLoaded) or "none".
+    block_resources : bool
+        Blocks requests for images, media and fonts.
+    disable_animations : bool
+        Makes CSS animations and transitions instant.
+    window_size : tuple of int
+        The window size of a headless Chrome.
+
+    """
+
+    # URL patterns blocked by block_resources.
+    BLOCKED_URL_PATTERNS = [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+        "*.mp4", "*.webm", "*.mp3", "*.ogg",
+        "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"
+    ]
+
+    def __init__(self,
+                 headless=False,
+                 page_load_strategy="normal",
+                 block_resources=False,
+                 disable_animations=False,
+                 window_size=(1920, 1080)):
+        if page_load_strategy not in ["normal", "eager", "none"]:
+            raise ValueError(f"Unknown page load strategy {page_load_strategy}.")
+
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.block_resources = block_resources
+        self.disable_animations = disable_animations
+        self.window_size = window_size
+    
+    
+    def chrome_options(self):
+        options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument("--headless")
+            options.add_argument("--window-size={},{}".format(*self.window_size))
+        if self.block_resources:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        options.set_capability("pageLoadStrategy", self.page_load_strategy)
+        return options
+    
+    
+    # Sets up what can only be set once the browser is running.
+    def prepare(self, driver):
+        if self.block_resources:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.BLOCKED_URL_PATTERNS})
+        if self.disable_animations:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NO_ANIMATIONS_SCRIPT})
+    
+    
+    def create_driver(self, PATH):
+        driver = webdriver.Chrome(PATH, options=self.chrome_options())
+        if not self.headless:
+            driver.maximize_window()
+        self.prepare(driver)
+        return driver
+
+
+
+LEAN = LaunchProfile(headless=True,
+                     page_load_strategy="eager",
+                     block_resources=True,
+                     disable_animations=True)
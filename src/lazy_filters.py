@@ -0,0 +1,66 @@
+
+class LazyFilters(dict):
+    """LazyFilters is the dict behind GlassdoorWebScraper.filters. It
+    re-reads only the filters invalidated by a filter change, and only
+    when they are next accessed.
+
+    Filters change when other filters are updated: a jobType or industry
+    change alters the options (and counts) of the companies and cityids
+    dropdowns, and those options are only rendered once a dropdown is
+    opened. So a change_*_to calls mark_changed(), which conservatively
+    marks every filter read so far as stale. A stale filter is re-read
+    through refresh(name) when it is accessed by key (filters[name] or
+    filters.get(name)); iterating and peek() return the options as they
+    are. Filters read after the change are fresh again.
+    
+    
+    Functions:
+
+    mark_changed()
+        Marks every filter read so far as stale.
+
+    peek(name, default=None)
+        Returns the options of a filter without re-reading it.
+
+    peek_all()
+        Returns every filter's options without re-reading any.
+
+    """
+
+    def __init__(self, refresh):
+        super().__init__()
+        self.refresh = refresh
+        self.stale = set()
+    
+    
+    def mark_changed(self):
+        self.stale.update(self.keys())
+    
+    
+    def __getitem__(self, name):
+        if name in self.stale:
+            self.stale.discard(name)
+            self.refresh(name)
+        return super().__getitem__(name)
+    
+    
+    def get(self, name, default=None):
+        if name not in self:
+            return default
+        return self[name]
+    
+    
+    # The options of name as they are (without re-reading a stale filter).
+    def peek(self, name, default=None):
+        return super().get(name, default)
+    
+    
+    # A plain dict of the options as they are, for internal reads
+    # (validating a filters URL, caching) that mustn't re-read filters.
+    def peek_all(self):
+        return {name: self.peek(name) for name in self}
+    
+    
+    def __setitem__(self, name, options):
+        self.stale.discard(name)
+        super().__setitem__(name, options)
@@ -118,6 +118,7 @@ class WebScrapingLocators:
     
         - Pop-up close button.
         - Joblistings list.
+        - Joblisting cards.
         - Page navigator.
         - Job Description column.
         - Try again button.
@@ -143,6 +144,20 @@ class WebScrapingLocators:
     JOBLISTINGS = (By.TAG_NAME, "li")
     
     
+    # Joblisting cards (the summary inside each joblisting li).
+    # The li itself carries the job id and, as a fallback for the
+    # card elements below, the job title and location as attributes.
+    CARD_JOB_ID_ATTR = "data-id"
+    CARD_JOB_TITLE_ATTR = "data-normalize-job-title"
+    CARD_LOCATION_ATTR = "data-job-loc"
+    CARD_LINK = (By.CLASS_NAME, "jobLink")
+    CARD_JOB_TITLE = (By.CSS_SELECTOR, "[data-test='job-link']")
+    CARD_COMPANY = (By.CLASS_NAME, "jobEmpolyerName")
+    CARD_LOCATION = (By.CLASS_NAME, "loc")
+    CARD_SALARY = (By.CSS_SELECTOR, "[data-test='detailSalary']")
+    CARD_AGE = (By.CSS_SELECTOR, "[data-test='job-age']")
+    
+    
     # Page navigators at the bottom of the page.
     FOOTER_PAGE_NAV = (By.ID, "FooterPageNav")
     PAGES_CONTAINER = (By.XPATH, "//div[@class='middle']")
@@ -0,0 +1,185 @@
+
+"""Multi-browser scraping of a single query.
+
+The page range of one query is sharded across n_workers processes.
+Every worker owns its own GlassdoorWebScraper (and thus its own
+Chrome instance created through get()), scrapes its assigned pages
+with iter_jobs(pages=...) (which opens them directly by URL, see
+GlassdoorWebScraper.go_to_page()), and returns its jobs grouped by page.
+The results are then merged in page order and de-duplicated.
+
+Functions:
+
+    assign_pages(pages, n_workers, assignment="contiguous")
+        Splits pages into n_workers lists of page numbers.
+
+    scrape_pages(URL, pages, PATH, use_script=True, cards_only=False, launch_profile=None)
+        The worker: scrapes pages of URL in its own browser.
+
+    job_key(jobinfo)
+        The key used to de-duplicate jobs across pages.
+
+    parallel_scrape_jobs(URL, pages, n_workers=4, ...)
+        Scrapes pages of URL across n_workers processes and returns a
+        DataFrame.
+
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from webscraper import GlassdoorWebScraper
+from records import jobs_to_frame
+
+
+def assign_pages(pages, n_workers, assignment="contiguous"):
+    """Splits pages into at most n_workers lists of page numbers.
+
+    Parameters
+    ----------
+    pages : iterable of int
+        The page numbers to scrape.
+    n_workers : int
+        The number of worker processes.
+    assignment : str or list of lists
+        "contiguous" gives each worker one run of consecutive pages
+        (workers open their first page by URL, then click through the run).
+        "interleaved" deals pages out round-robin (page i goes to
+        worker i % n_workers, which evens out slow pages).
+        A list of lists of page numbers is used as is.
+
+    Returns
+    -------
+    type
+        list
+    describe
+        A list of non-empty lists of page numbers, one per worker.
+
+    Examples
+    --------
+    input : range(1, 8), 3, "contiguous"
+    output : [[1, 2, 3], [4, 5], [6, 7]]
+
+    input : range(1, 8), 3, "interleaved"
+    output : [[1, 4, 7], [2, 5], [3, 6]]
+
+    """
+    if not isinstance(assignment, str):
+        return [list(worker_pages) for worker_pages in assignment if worker_pages]
+
+    pages = sorted(set(pages))
+    n_workers = max(1, min(n_workers, len(pages)))
+
+    if assignment == "contiguous":
+        size, remainder = divmod(len(pages), n_workers)
+        assigned, start = [], 0
+        for worker in range(n_workers):
+            end = start + size + (worker < remainder)
+            assigned.append(pages[start:end])
+            start = end
+    elif assignment == "interleaved":
+        assigned = [pages[worker::n_workers] for worker in range(n_workers)]
+    else:
+        raise ValueError(f"Unknown page assignment {assignment}.")
+
+    return [worker_pages for worker_pages in assigned if worker_pages]
+
+
+# Note: scrape_pages runs in a worker process, so it must stay a
+# module level function (it is pickled by the ProcessPoolExecutor).
+def scrape_pages(URL, pages, PATH, use_script=True, cards_only=False, launch_profile=None):
+    scraper = GlassdoorWebScraper(keyword="", PATH=PATH, launch_profile=launch_profile)
+    scraper.URL = URL
+
+    jobs_by_page = {page: [] for page in pages}
+    try:
+        scraper.get()
+        for jobinfo in scraper.iter_jobs(use_script=use_script,
+                                         cards_only=cards_only,
+                                         pages=pages):
+            jobs_by_page[scraper.page_counter].append(jobinfo)
+
+    # A failing worker still returns the pages it has scraped.
+    except:
+        print(f"Cannot scrape all of pages {pages}.")
+    finally:
+        try:
+            scraper.quit()
+        except:
+            pass
+    return jobs_by_page
+
+
+# Cards carry a stable job id; detailed jobs fall back to the
+# fields that identify a posting.
+def job_key(jobinfo):
+    if jobinfo.get("job id"):
+        return jobinfo["job id"]
+    return tuple(jobinfo.get(feature) for feature in ["company",
+                                                      "job title",
+                                                      "headquarters",
+                                                      "job description"])
+
+
+def parallel_scrape_jobs(URL,
+                         pages,
+                         n_workers=4,
+                         assignment="contiguous",
+                         PATH="C:\\Program Files (x86)\\chromedriver.exe",
+                         use_script=True,
+                         cards_only=False,
+                         launch_profile=None):
+    """Scrapes pages of one query across n_workers browser processes.
+
+    Parameters
+    ----------
+    URL : str
+        The query URL every worker opens, e.g. a GlassdoorWebScraper's
+        URL or its driver.current_url after filters have been applied.
+    pages : int or iterable of int
+        The page numbers to scrape. An int n means pages 1 to n.
+    n_workers : int
+        The number of worker processes (and browsers).
+    assignment : str or list of lists
+        How pages are split across workers, see assign_pages().
+    PATH : str
+        The path to your chromedriver.exe.
+    use_script, cards_only : bool
+        Passed on to iter_jobs().
+    launch_profile : LaunchProfile, optional
+        How every worker launches Chrome, e.g. launch_profile.LEAN to
+        fit more browsers on one machine.
+
+    Returns
+    -------
+    type
+        pd.DataFrame
+    describe
+        The jobs of every page in page order, de-duplicated by job_key().
+
+    """
+    if isinstance(pages, int):
+        pages = range(1, pages + 1)
+    assigned = assign_pages(pages, n_workers, assignment)
+
+    jobs_by_page = {}
+    with ProcessPoolExecutor(max_workers=len(assigned)) as executor:
+        futures = [executor.submit(scrape_pages,
+                                   URL,
+                                   worker_pages,
+                                   PATH,
+                                   use_script,
+                                   cards_only,
+                                   launch_profile) for worker_pages in assigned]
+        for future in futures:
+            jobs_by_page.update(future.result())
+
+    # Merge in page order, keeping the first occurrence of a job.
+    jobs, seen = [], set()
+    for page in sorted(jobs_by_page):
+        for jobinfo in jobs_by_page[page]:
+            key = job_key(jobinfo)
+            if key in seen:
+                continue
+            seen.add(key)
+            jobs.append(jobinfo)
+    return jobs_to_frame(jobs)
@@ -0,0 +1,185 @@
+
+"""The typed job record produced by WebScrapingElements.parse_jobinfo().
+
+Functions:
+
+    records_to_columns(records, features=None)
+        Transposes JobRecords (or dicts) into a dict of columns.
+
+    records_to_batch(records, features=None, dictionary_features=())
+        Converts JobRecords (or dicts) into a pyarrow RecordBatch.
+
+    jobs_to_frame(jobs)
+        Builds a DataFrame from JobRecords and/or dicts.
+
+"""
+
+import pandas as pd
+
+
+class JobRecord:
+    """JobRecord holds the job info 1-4 features of one joblisting.
+
+    Every feature is an optional string: None means the feature is
+    missing from the joblisting (the old dict records used -1, which
+    forced object columns of mixed ints and strings).
+
+    __slots__ keeps a record to its fields (no per-record __dict__ or
+    repeated string keys). Records can still be read like the old dicts
+    by feature name (record["job title"], record.get("company"),
+    dict(record)) so code that consumed dicts keeps working.
+
+    Note: only the 6 known EmpBasicInfo features (size, founded, type,
+    industry, sector, revenue) are kept; any other EmpBasicInfo label
+    is dropped.
+
+    """
+
+    __slots__ = (
+        "company",
+        "job_title",
+        "headquarters",
+        "salary_estimate",
+        "job_type",
+        "size",
+        "founded",
+        "type",
+        "industry",
+        "sector",
+        "revenue",
+        "job_description"
+    )
+
+    # Feature (column) names, in column order, and their attributes.
+    FEATURES = {
+        "company": "company",
+        "job title": "job_title",
+        "headquarters": "headquarters",
+        "salary estimate": "salary_estimate",
+        "job type": "job_type",
+        "size": "size",
+        "founded": "founded",
+        "type": "type",
+        "industry": "industry",
+        "sector": "sector",
+        "revenue": "revenue",
+        "job description": "job_description"
+    }
+
+    # The EmpBasicInfo (job info 3) features, by their labels.
+    JOBINFO3_FEATURES = ("size", "founded", "type", "industry", "sector", "revenue")
+
+    def __init__(self,
+                 company=None,
+                 job_title=None,
+                 headquarters=None,
+                 salary_estimate=None,
+                 job_type=None,
+                 size=None,
+                 founded=None,
+                 type=None,
+                 industry=None,
+                 sector=None,
+                 revenue=None,
+                 job_description=None):
+        self.company = company
+        self.job_title = job_title
+        self.headquarters = headquarters
+        self.salary_estimate = salary_estimate
+        self.job_type = job_type
+        self.size = size
+        self.founded = founded
+        self.type = type
+        self.industry = industry
+        self.sector = sector
+        self.revenue = revenue
+        self.job_description = job_description
+    
+    
+    # Builds a record from a dict keyed by feature name (e.g. a job
+    # loaded back from a ScrapeJournal); -1 is read as missing.
+    @classmethod
+    def from_dict(cls, jobinfo):
+        record = cls()
+        for feature, attribute in cls.FEATURES.items():
+            value = jobinfo.get(feature)
+            setattr(record, attribute, None if value == -1 else value)
+        return record
+    
+    
+    def keys(self):
+        return self.FEATURES.keys()
+    
+    
+    def __getitem__(self, feature):
+        return getattr(self, self.FEATURES[feature])
+    
+    
+    def get(self, feature, default=None):
+        attribute = self.FEATURES.get(feature)
+        if attribute is None:
+            return default
+        return getattr(self, attribute)
+    
+    
+    def to_dict(self):
+        return {feature: getattr(self, attribute) for feature, attribute in self.FEATURES.items()}
+    
+    
+    def __eq__(self, other):
+        if not isinstance(other, JobRecord):
+            return NotImplemented
+        return all(getattr(self, attribute) == getattr(other, attribute)
+                   for attribute in self.__slots__)
+    
+    
+    def __repr__(self):
+        fields = ", ".join(f"{attribute}={getattr(self, attribute)!r}"
+                           for attribute in self.__slots__)
+        return f"JobRecord({fields})"
+
+
+
+# Transposes records into {feature: list of values} for features
+# (defaults to every JobRecord feature). The lists hold references to 
+# the records' strings, so no string is copied. Dict records (e.g. jobs
+# loaded back from a ScrapeJournal) are read by key; values that aren't
+# strings (-1 for a missing feature) are read as None.
+def records_to_columns(records, features=None):
+    features = list(JobRecord.FEATURES) if features is None else list(features)
+    columns = {feature: [] for feature in features}
+    appends = [(columns[feature].append, feature, JobRecord.FEATURES.get(feature))
+               for feature in features]
+    for record in records:
+        if isinstance(record, JobRecord):
+            for append, feature, attribute in appends:
+                append(getattr(record, attribute) if attribute is not None else None)
+        else:
+            for append, feature, attribute in appends:
+                value = record.get(feature)
+                append(value if isinstance(value, str) else None)
+    return columns
+
+
+# Every column is a nullable string; dictionary_features are dictionary
+# encoded (int32 indices).
+# Note: requires pyarrow, an optional dependency (the parquet extra).
+def records_to_batch(records, features=None, dictionary_features=()):
+    import pyarrow as pa
+
+    columns = records_to_columns(records, features)
+    arrays = []
+    for feature, column in columns.items():
+        array = pa.array(column, type=pa.string())
+        if feature in dictionary_features:
+            array = array.dictionary_encode()
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, names=list(columns))
+
+
+# JobRecords are built column by column into string dtype columns;
+# anything else (e.g. card dicts) falls back to a list of dicts.
+def jobs_to_frame(jobs):
+    if jobs and all(isinstance(job, JobRecord) for job in jobs):
+        return pd.DataFrame(records_to_columns(jobs)).astype("string")
+    return pd.DataFrame([dict(job) for job in jobs])
@@ -0,0 +1,96 @@
+
+from selenium.common.exceptions import WebDriverException
+
+
+# The memory of a driver's Chrome in MB: the RSS of every process
+# chromedriver started if psutil (the memory extra) is installed, else 
+# the JS heap of the current tab (a lower bound). None if neither can 
+# be read.
+def get_browser_memory(driver):
+    try:
+        import psutil
+
+        chromedriver = psutil.Process(driver.service.process.pid)
+        rss = sum(process.memory_info().rss for process in chromedriver.children(recursive=True))
+        return rss / 2 ** 20
+    except:
+        pass
+
+    try:
+        heap = driver.execute_script("return performance.memory ? performance.memory.usedJSHeapSize : null;")
+    except WebDriverException:
+        return None
+    return heap / 2 ** 20 if heap else None
+
+
+class RecyclePolicy:
+    """RecyclePolicy decides when iter_jobs() restarts its browser, to
+    bound Chrome's memory growth over long runs (the same tab clicking
+    through thousands of joblistings keeps growing).
+
+    The browser is recycled between pages once any budget is used up:
+    every_jobs jobs or every_pages pages since the last restart, or
+    max_memory_mb of browser memory (see get_browser_memory()). The new
+    browser opens the next page of the same query URL directly, so the
+    job stream continues without duplicates or gaps.
+
+    Budgets left as None are not checked; the counts carry over between
+    iter_jobs() calls of the same driver.
+
+
+    Parameters
+    ----------
+    every_jobs : int, optional
+        Recycle after this many jobs.
+    every_pages : int, optional
+        Recycle after this many pages.
+    max_memory_mb : float, optional
+        Recycle once the browser uses more memory than this.
+    
+    
+    Functions:
+
+    record_page(n_jobs)
+        Counts a finished page and its jobs.
+
+    is_due(driver)
+        Returns True if any budget is used up.
+
+    reset()
+        Starts counting again after a restart.
+
+    """
+
+    def __init__(self, every_jobs=None, every_pages=None, max_memory_mb=None):
+        if not (every_jobs or every_pages or max_memory_mb):
+            raise ValueError("At least one of every_jobs, every_pages and max_memory_mb must be given.")
+
+        self.every_jobs = every_jobs
+        self.every_pages = every_pages
+        self.max_memory_mb = max_memory_mb
+
+        self.n_jobs = 0
+        self.n_pages = 0
+        self.n_recycles = 0
+    
+    
+    def record_page(self, n_jobs):
+        self.n_jobs += n_jobs
+        self.n_pages += 1
+    
+    
+    def is_due(self, driver):
+        if self.every_jobs and self.n_jobs >= self.every_jobs:
+            return True
+        if self.every_pages and self.n_pages >= self.every_pages:
+            return True
+        if self.max_memory_mb:
+            memory = get_browser_memory(driver)
+            return memory is not None and memory > self.max_memory_mb
+        return False
+    
+    
+    def reset(self):
+        self.n_jobs = 0
+        self.n_pages = 0
+        self.n_recycles += 1
@@ -0,0 +1,404 @@
+
+from locators import ConfigLocators as CL
+from locators import WebScrapingLocators as WSL
+
+
+# CL = ConfigLocators
+# WSL = WebScrapingLocators
+
+
+# Shared JS helpers prepended to every script below.
+# find(root, locator, all) resolves a selenium (By, value) locator
+# passed in from python so the scripts reuse the exact same
+# selectors as locators.py instead of hardcoding their own.
+_PRELUDE = """
+function find(root, locator, all) {
+    var by = locator[0], value = locator[1], found = [];
+    if (by === "id") {
+        found = root.querySelectorAll('[id="' + value + '"]');
+    } else if (by === "class name") {
+        found = root.getElementsByClassName(value);
+    } else if (by === "tag name") {
+        found = root.getElementsByTagName(value);
+    } else if (by === "css selector") {
+        found = root.querySelectorAll(value);
+    } else if (by === "xpath") {
+        var snapshot = document.evaluate(value, root, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        found = [];
+        for (var i = 0; i < snapshot.snapshotLength; i++) {
+            found.push(snapshot.snapshotItem(i));
+        }
+    }
+    found = Array.prototype.slice.call(found);
+    return all ? found : (found[0] || null);
+}
+function chain(root, locators) {
+    for (var i = 0; root && i < locators.length; i++) {
+        root = find(root, locators[i], false);
+    }
+    return root;
+}
+function text(element) {
+    return element ? element.innerText.trim() : null;
+}
+function texts(elements) {
+    return elements.map(function (element) { return text(element); });
+}
+"""
+
+
+class ConfigScripts:
+    """ConfigScripts contains the JavaScript run through
+    driver.execute_script() while configuring the filters.
+
+    Follows the same conventions as WebScrapingScripts.
+
+    The scripts are as follows:
+
+        - Salary bins in one round trip.
+        - Filter dropdowns in one round trip.
+
+    """
+
+    # Salary bins in one round trip (run with execute_async_script).
+    # With the salary dropdown open, walks the right handle to the right
+    # edge and the left handle to the left edge, then steps the left handle
+    # right reading the histogram label header after every step, all with
+    # scripted key presses. Returns every bin like initialize_salary_bins() 
+    # reads them, or null if the slider doesn't respond to scripted keys.
+    # Note: the sliders are left moved; close the dropdown without applying.
+    SALARY_BINS_LOCATORS = {
+        "primary_dropdown": list(CL.PRIMARY_DROPDOWN),
+        "histogram": list(CL.HISTOGRAM),
+        "histogram_divs": list(CL.HISTOGRAM_DIVS),
+        "left_slider": list(CL.LEFT_SLIDER),
+        "right_slider": list(CL.RIGHT_SLIDER),
+        "hist_label": list(CL.HIST_LABEL),
+        "hist_label_header": list(CL.HIST_LABEL_HEADER),
+    }
+    SALARY_BINS = _PRELUDE + """
+    var L = arguments[0], done = arguments[arguments.length - 1];
+    var dropdown = find(document, L.primary_dropdown, false);
+    var histogram = dropdown ? find(dropdown, L.histogram, false) : null;
+    var left = dropdown ? find(dropdown, L.left_slider, false) : null;
+    var right = dropdown ? find(dropdown, L.right_slider, false) : null;
+
+    // Same parsing as regex_parse_salary().
+    function header() {
+        var h = chain(document, [L.hist_label, L.hist_label_header]);
+        return h ? h.innerText.replace(/\\$/g, "").split("-") : null;
+    }
+    if (!histogram || !left || !right || !header()) { done(null); return; }
+    var nBars = find(histogram, L.histogram_divs, true).length;
+
+    function press(handle, key, keyCode) {
+        handle.dispatchEvent(new KeyboardEvent("keydown", 
+            {key: key, keyCode: keyCode, which: keyCode, bubbles: true}));
+    }
+
+    // Presses key until header()[endpoint] stops changing (the handle hit
+    // an edge), calling onStep with every new header, then then(last header).
+    // Every step waits a tick for the slider to re-render.
+    function walk(handle, key, keyCode, endpoint, onStep, then) {
+        var before = header(), steps = 0;
+        function step() {
+            press(handle, key, keyCode);
+            setTimeout(function () {
+                var current = header();
+                if (!current || current[endpoint] === before[endpoint] || ++steps > nBars) {
+                    then(before);
+                    return;
+                }
+                before = current;
+                if (onStep) { onStep(current); }
+                step();
+            }, 0);
+        }
+        step();
+    }
+
+    walk(right, "ArrowRight", 39, 1, null, function () {
+        walk(left, "ArrowLeft", 37, 0, null, function (first) {
+            var bins = [first[0]];
+            walk(left, "ArrowRight", 39, 0, function (current) {
+                bins.push(current[0]);
+            }, function (last) {
+                bins.push(last[1]);
+                done(bins.length > 2 || nBars <= 2 ? bins : null);
+            });
+        });
+    });
+    """
+
+
+    # Filter dropdowns in one round trip (run with execute_async_script).
+    # Opens every filter of arguments[1] (a list of [name, locator, is_more])
+    # in turn the way init_filter() does (toggling the More dropdown for
+    # "More" filters), then the sortby dropdown if arguments[2].read_sortby,
+    # and returns {name: dropdown ul text}. A filter whose dropdown doesn't
+    # show within arguments[2].timeout_ms is left out.
+    # FILTER_LOCATORS maps the get_join_filters names to their filter button.
+    FILTER_LOCATORS = {
+        "jobtypes": list(CL.FILTER_JOBTYPE),
+        "postdates": list(CL.FILTER_FROMAGE),
+        "radii": list(CL.FILTER_RADIUS),
+        "cityids": list(CL.FILTER_CITYID),
+        "industries": list(CL.FILTER_INDUSTRYID),
+        "job_functions": list(CL.FILTER_JOBFUNCTIONS),
+        "seniority_labels": list(CL.FILTER_SENIORITYLABELS),
+        "companies": list(CL.FILTER_COMPANIES),
+        "company_sizes": list(CL.FILTER_COMPANYSIZES),
+    }
+    FILTER_TEXTS_LOCATORS = {
+        "primary_dropdown": list(CL.PRIMARY_DROPDOWN),
+        "dropdown_ul": list(CL.DROPDOWN_UL),
+        "dkfilters": list(CL.DKFILTERS),
+        "filter_more": list(CL.FILTER_MORE),
+        "main_col": list(CL.MAIN_COL),
+        "filter_mostrelevant": list(CL.FILTER_MOSTRELEVANT),
+        "body": list(CL.BODY),
+        "mostrelevant_dropdown": list(CL.MOSTRELEVANT_DROPDOWN),
+        "mostrelevant_dropdown_ul": list(CL.MOSTRELEVANT_DROPDOWN_UL),
+    }
+    FILTER_TEXTS = _PRELUDE + """
+    var L = arguments[0], filters = arguments[1], options = arguments[2];
+    var done = arguments[arguments.length - 1];
+    var texts = {}, previous = null;
+
+    // Calls then with the first non-null getter() result, polling every
+    // options.poll_ms (then(null) after options.timeout_ms).
+    function waitFor(getter, then) {
+        var waited = 0;
+        (function poll() {
+            var found = getter();
+            if (found || waited >= options.timeout_ms) { then(found || null); return; }
+            waited += options.poll_ms;
+            setTimeout(poll, options.poll_ms);
+        })();
+    }
+
+    // The primary dropdown ul, once it is not the one read last.
+    function openedDropdownUl() {
+        var ul = chain(document, [L.primary_dropdown, L.dropdown_ul]);
+        if (!ul || (previous && ul === previous.ul && ul.innerText === previous.text)) {
+            return null;
+        }
+        return ul;
+    }
+
+    function clickMore() {
+        var more = chain(document, [L.dkfilters, L.filter_more]);
+        if (more) { more.click(); }
+    }
+
+    function readFilter(idx) {
+        if (idx === filters.length) { readSortby(); return; }
+        var name = filters[idx][0], isMore = filters[idx][2];
+
+        if (isMore) { clickMore(); }
+        var filter = find(document, filters[idx][1], false);
+        if (!filter) {
+            if (isMore) { clickMore(); }
+            readFilter(idx + 1);
+            return;
+        }
+        filter.click();
+
+        waitFor(openedDropdownUl, function (ul) {
+            if (ul) {
+                texts[name] = ul.innerText;
+                previous = {ul: ul, text: ul.innerText};
+            }
+            if (isMore) {
+                clickMore();
+                clickMore();
+            } else {
+                filter.click();
+            }
+            readFilter(idx + 1);
+        });
+    }
+
+    function readSortby() {
+        var sortby = options.read_sortby ? chain(document, [L.main_col, L.filter_mostrelevant]) : null;
+        if (!sortby) { done(texts); return; }
+        sortby.click();
+
+        waitFor(function () {
+            return chain(document, [L.body, L.mostrelevant_dropdown, L.mostrelevant_dropdown_ul]);
+        }, function (ul) {
+            if (ul) { texts.sortbys = ul.innerText; }
+            sortby.click();
+            done(texts);
+        });
+    }
+
+    readFilter(0);
+    """
+
+
+
+class WebScrapingScripts:
+    """WebScrapingScripts contains the JavaScript run through
+    driver.execute_script() while webscraping.
+
+    Scripts are in uppercase because they are constants. Every script
+    takes its locators as arguments (see the *_LOCATORS dicts) so that
+    WebScrapingLocators stays the single source of truth for selectors.
+
+    The scripts are as follows:
+
+        - Job Info I-IV in one round trip.
+        - Joblisting cards in one round trip.
+        - Job description column outerHTML.
+        - Presence probe.
+        - Pop-up observer.
+        - Open a tab.
+        - Navigate without waiting.
+
+    """
+
+    # Job Info I-IV in one round trip.
+    # Returns the raw text of each job info group exactly as
+    # get_jobinfo1() through get_jobinfo4() would read it;
+    # parse_jobinfo() turns it into a record.
+    JOBINFO_LOCATORS = {
+        "jd_col": list(WSL.JD_COL),
+        "header": list(WSL.HEADER),
+        "header_job_info": list(WSL.HEADER_JOB_INFO),
+        "job_info_1": list(WSL.JOB_INFO_1),
+        "job_info_2_container": list(WSL.JOB_INFO_2_CONTAINER),
+        "job_info_2": list(WSL.JOB_INFO_2),
+        "emp_basic_info": list(WSL.EMP_BASIC_INFO),
+        "comp_overview_container": list(WSL.COMP_OVERVIEW_CONTAINER),
+        "job_desc_container": list(WSL.JOB_DESC_CONTAINER),
+        "job_info_4": list(WSL.JOB_INFO_4),
+    }
+    JOBINFO = _PRELUDE + """
+    var L = arguments[0];
+    var jdCol = find(document, L.jd_col, false);
+    if (!jdCol) { return null; }
+
+    var headerJobInfo = chain(jdCol, [L.header, L.header_job_info]);
+    var jobinfo1 = headerJobInfo ? texts(find(headerJobInfo, L.job_info_1, true)) : [];
+
+    var containers = find(jdCol, L.job_info_2_container, true);
+    var jobinfo2 = containers.length > 1 ? texts(find(containers[1], L.job_info_2, true)) : [];
+
+    var jobinfo3 = text(chain(document, [L.emp_basic_info, L.comp_overview_container]));
+    var jobinfo4 = text(chain(document, [L.job_desc_container, L.job_info_4]));
+
+    return {
+        "jobinfo1": jobinfo1,
+        "jobinfo2": jobinfo2,
+        "jobinfo3": jobinfo3,
+        "jobinfo4": jobinfo4
+    };
+    """
+
+
+    # Joblisting cards in one round trip.
+    # Returns a list with one dict per joblisting li of the MainCol
+    # list, in page order.
+    CARDS_LOCATORS = {
+        "main_col": list(WSL.MAIN_COL),
+        "joblisting_container": list(WSL.JOBLISTING_CONTAINER),
+        "joblistings": list(WSL.JOBLISTINGS),
+        "job_id_attr": WSL.CARD_JOB_ID_ATTR,
+        "job_title_attr": WSL.CARD_JOB_TITLE_ATTR,
+        "location_attr": WSL.CARD_LOCATION_ATTR,
+        "link": list(WSL.CARD_LINK),
+        "job_title": list(WSL.CARD_JOB_TITLE),
+        "company": list(WSL.CARD_COMPANY),
+        "location": list(WSL.CARD_LOCATION),
+        "salary": list(WSL.CARD_SALARY),
+        "age": list(WSL.CARD_AGE),
+    }
+    CARDS = _PRELUDE + """
+    var L = arguments[0];
+    var container = chain(document, [L.main_col, L.joblisting_container]);
+    if (!container) { return []; }
+
+    return find(container, L.joblistings, true).map(function (li) {
+        var link = find(li, L.link, false);
+        return {
+            "job id": li.getAttribute(L.job_id_attr),
+            "job title": text(find(li, L.job_title, false)) || li.getAttribute(L.job_title_attr),
+            "company": text(find(li, L.company, false)),
+            "location": text(find(li, L.location, false)) || li.getAttribute(L.location_attr),
+            "salary estimate": text(find(li, L.salary, false)),
+            "age": text(find(li, L.age, false)),
+            "link": link ? link.href : null
+        };
+    });
+    """
+
+
+    # Job description column outerHTML (for capture mode).
+    # Returns None if there is no JD_COL.
+    JDCOL_HTML_LOCATORS = {
+        "jd_col": list(WSL.JD_COL),
+    }
+    JDCOL_HTML = _PRELUDE + """
+    var jdCol = find(document, arguments[0].jd_col, false);
+    return jdCol ? jdCol.outerHTML : null;
+    """
+
+
+    # Presence probe.
+    # Walks a chain of locators from the document and returns the element
+    # (a WebElement in python) or null right away; unlike find_element it
+    # is not held up by the implicit wait when the element is absent.
+    PROBE = _PRELUDE + """
+    return chain(document, arguments[0]);
+    """
+
+
+    # Pop-up observer.
+    # Installs a MutationObserver (once per page load) that clicks the
+    # pop-up close button as soon as it is added to the page. Dismissals 
+    # are counted in sessionStorage so the count survives page loads.
+    # Returns true if the observer was installed, false if it already was.
+    POPUP_OBSERVER_LOCATORS = {
+        "popup_close_btn": list(WSL.POPUP_CLOSE_BTN),
+    }
+    POPUP_OBSERVER = _PRELUDE + """
+    if (window.__popupObserver) { return false; }
+    var L = arguments[0];
+
+    function dismiss() {
+        find(document, L.popup_close_btn, true).forEach(function (button) {
+            if (button.__dismissed) { return; }
+            button.__dismissed = true;
+            button.click();
+            var n = parseInt(sessionStorage.getItem("popupDismissals") || "0", 10);
+            sessionStorage.setItem("popupDismissals", String(n + 1));
+        });
+    }
+
+    window.__popupObserver = new MutationObserver(dismiss);
+    window.__popupObserver.observe(document.documentElement, {childList: true, subtree: true});
+    dismiss();
+    return true;
+    """
+    POPUP_DISMISSALS = """
+    return parseInt(sessionStorage.getItem("popupDismissals") || "0", 10);
+    """
+
+
+    # Open a tab.
+    # Opens arguments[0] (a joblisting link or a results page) in a new 
+    # tab in the background; the current tab stays the driver's window.
+    OPEN_TAB = """
+    window.open(arguments[0], "_blank");
+    """
+
+
+    # Navigate without waiting.
+    # Starts loading arguments[0] in the current tab only after the script
+    # has returned, so the driver doesn't wait for the page load.
+    NAVIGATE = """
+    var URL = arguments[0];
+    setTimeout(function () { window.location.href = URL; }, 0);
+    """
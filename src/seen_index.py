@@ -0,0 +1,133 @@
+
+import math
+import sqlite3
+import hashlib
+
+
+class BloomFilter:
+    """BloomFilter is an in-memory probabilistic set used as a prefilter
+    in front of the SQLite lookup of SeenJobIndex.
+
+    A negative answer is always right (the key was never added), so most
+    unseen joblistings never touch the database. A positive answer is
+    right up to error_rate and is confirmed against the database.
+
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(1, int(capacity))
+        self.n_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.n_bits + 7) // 8)
+    
+    
+    # Double hashing: the k bit positions are h1 + i * h2.
+    def positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.n_bits for i in range(self.n_hashes)]
+    
+    
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+    
+    
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self.positions(key))
+
+
+
+class SeenJobIndex:
+    """SeenJobIndex is a persistent index of the joblistings already scraped,
+    so that later runs can skip them before clicking.
+
+    Keys are stable job identifiers (see seen_key()). They are kept in a
+    single SQLite table whose primary key index makes lookups fast at
+    millions of entries. Adds are batched into one transaction per
+    commit() (iter_jobs commits once per page).
+
+    If use_bloom is True, an in-memory BloomFilter is built from the
+    stored keys on open and checked before every SQLite lookup.
+    
+    
+    Functions:
+
+    seen_key(card)
+        Returns the key of a joblisting card.
+
+    add(key)
+        Adds a key to the index.
+
+    commit()
+        Commits the added keys to disk.
+
+    rollback()
+        Drops the keys added since the last commit.
+
+    close()
+        Commits and closes the index.
+
+    """
+
+    def __init__(self, path, use_bloom=False, bloom_capacity=1_000_000, error_rate=0.01):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS seen "
+                                "(key TEXT PRIMARY KEY) WITHOUT ROWID")
+        self.connection.commit()
+
+        self.bloom = None
+        if use_bloom:
+            n_keys = self.connection.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+            self.bloom = BloomFilter(max(bloom_capacity, 2 * n_keys), error_rate)
+            for (key,) in self.connection.execute("SELECT key FROM seen"):
+                self.bloom.add(key)
+    
+    
+    # The job id of the joblisting li if there is one, else a hash
+    # of company, job title and location. Returns None if the card has
+    # none of these (such a joblisting is never skipped).
+    @staticmethod
+    def seen_key(card):
+        if card.get("job id"):
+            return "id:" + str(card["job id"])
+        fields = [str(card.get(feature) or "").strip().lower() for feature in ["company",
+                                                                               "job title",
+                                                                               "location"]]
+        if not any(fields):
+            return None
+        return "sha1:" + hashlib.sha1("\x1f".join(fields).encode("utf-8")).hexdigest()
+    
+    
+    def __contains__(self, key):
+        if self.bloom is not None and key not in self.bloom:
+            return False
+        return self.connection.execute("SELECT 1 FROM seen WHERE key = ?",
+                                       (key,)).fetchone() is not None
+    
+    
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+    
+    
+    def add(self, key):
+        self.connection.execute("INSERT OR IGNORE INTO seen (key) VALUES (?)", (key,))
+        if self.bloom is not None:
+            self.bloom.add(key)
+    
+    
+    def commit(self):
+        self.connection.commit()
+    
+    
+    # The bloom filter keeps rolled back keys, which only costs a
+    # confirming SQLite lookup when they are checked.
+    def rollback(self):
+        self.connection.rollback()
+    
+    
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
@@ -0,0 +1,132 @@
+
+import queue
+import threading
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+
+class SessionPool:
+    """SessionPool keeps up to n_sessions warm Chrome drivers alive and
+    hands them out to queries, so that switching keyword or location
+    doesn't pay for a Chrome startup and a cold cache every time.
+
+    GlassdoorWebScraper.get(pool=...) acquires a driver from the pool
+    and opens its URL; quit() releases the driver back instead of quitting
+    it. On release a driver is reset (extra tabs closed, navigated to
+    about:blank); the next query's URL sets every filter. Cookies and the
+    browser cache are kept.
+
+    Drivers are created lazily. acquire() blocks while all n_sessions are
+    in use, and health checks the driver it hands out: a driver that
+    doesn't respond is quit and replaced.
+    
+    
+    Functions:
+
+    acquire(timeout=None)
+        Returns a healthy driver.
+
+    release(driver)
+        Resets a driver and returns it to the pool.
+
+    close()
+        Quits every driver.
+
+    """
+
+    def __init__(self, 
+                 n_sessions=4, 
+                 PATH="C:\\Program Files (x86)\\chromedriver.exe", 
+                 launch_profile=None):
+        self.n_sessions = n_sessions
+        self.PATH = PATH
+        self.launch_profile = launch_profile
+        self.idle = queue.Queue()
+        self.n_created = 0
+        self.lock = threading.Lock()
+    
+    
+    # Starts a new driver, with launch_profile (a LaunchProfile) if given. 
+    # Override to customize how drivers are launched further.
+    def create_driver(self):
+        if self.launch_profile is not None:
+            return self.launch_profile.create_driver(self.PATH)
+        driver = webdriver.Chrome(self.PATH)
+        driver.maximize_window()
+        return driver
+    
+    
+    def is_healthy(self, driver):
+        try:
+            driver.execute_script("return 1;")
+            return True
+        except WebDriverException:
+            return False
+    
+    
+    def discard(self, driver):
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        with self.lock:
+            self.n_created -= 1
+    
+    
+    def acquire(self, timeout=None):
+        with self.lock:
+            can_create = self.idle.empty() and self.n_created < self.n_sessions
+            if can_create:
+                self.n_created += 1
+        if can_create:
+            try:
+                return self.create_driver()
+            except:
+                with self.lock:
+                    self.n_created -= 1
+                raise
+
+        driver = self.idle.get(timeout=timeout)
+        if self.is_healthy(driver):
+            return driver
+
+        # Replace the dead session.
+        self.discard(driver)
+        return self.acquire(timeout)
+    
+    
+    # Closes every tab but the first and leaves it on a blank page.
+    def reset(self, driver):
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get("about:blank")
+    
+    
+    def release(self, driver):
+        try:
+            self.reset(driver)
+        except WebDriverException:
+            self.discard(driver)
+            return
+        self.idle.put(driver)
+    
+    
+    def close(self):
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                return
+            self.discard(driver)
+    
+    
+    def __enter__(self):
+        return self
+    
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
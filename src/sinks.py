@@ -0,0 +1,189 @@
+
+"""Sinks for scrape output that write records as they arrive.
+
+A sink has a write(jobinfo) and a close() method (and is a context
+manager); GlassdoorWebScraper.scrape_jobs_to_sink() streams
+iter_jobs() into one so that nothing is held in memory.
+
+Note: ArrowSink requires pyarrow, which is an optional dependency
+(the parquet extra, or pip install pyarrow).
+
+"""
+
+import queue
+import threading
+
+from records import JobRecord, records_to_batch
+
+
+# The job info 1-4 features (see WebScrapingElements.parse_jobinfo()),
+# in column order.
+JOBINFO_FIELDS = list(JobRecord.FEATURES)
+
+# High repetition features that are dictionary encoded.
+DICTIONARY_FIELDS = [
+    "company",
+    "industry",
+    "sector",
+    "size",
+    "revenue"
+]
+
+
+class JobSink:
+    """JobSink is the base class of sinks. Subclasses implement write()
+    and close().
+
+    """
+
+    def write(self, jobinfo):
+        raise NotImplementedError
+    
+    
+    def write_many(self, jobinfos):
+        n_written = 0
+        for jobinfo in jobinfos:
+            self.write(jobinfo)
+            n_written += 1
+        return n_written
+    
+    
+    def close(self):
+        raise NotImplementedError
+    
+    
+    def __enter__(self):
+        return self
+    
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+
+class ArrowSink(JobSink):
+    """ArrowSink writes records to a Parquet or Arrow IPC stream file in
+    bounded row groups.
+
+    Records are buffered on the scraping thread until row_group_size of
+    them are collected; the chunk is then handed to a background writer
+    thread through a queue of at most queue_size chunks (write() blocks
+    when the writer falls behind, which bounds memory), so columnar
+    conversion and disk I/O stay off the scraping thread.
+
+    Every column is a nullable string with a fixed schema (fields);
+    missing features (None, or -1 in dict records) are written as nulls and
+    dictionary_fields are dictionary encoded.
+
+    Parameters
+    ----------
+    path : str
+        The output file.
+    file_format : str
+        "parquet" or "arrow" (the Arrow IPC stream format, which unlike
+        the IPC file format allows each chunk its own dictionaries).
+    row_group_size : int
+        The number of records per row group (Parquet) or record batch (Arrow).
+    queue_size : int
+        The maximum number of chunks waiting for the writer thread.
+    fields, dictionary_fields : list of str
+        The columns of the schema and which of them are dictionary encoded.
+        Record keys not in fields are dropped.
+
+    """
+
+    def __init__(self,
+                 path,
+                 file_format="parquet",
+                 row_group_size=10_000,
+                 queue_size=4,
+                 fields=JOBINFO_FIELDS,
+                 dictionary_fields=DICTIONARY_FIELDS):
+        import pyarrow as pa
+
+        if file_format not in ["parquet", "arrow"]:
+            raise ValueError(f"Unknown file format {file_format}.")
+
+        self.path = path
+        self.file_format = file_format
+        self.row_group_size = row_group_size
+        self.fields = list(fields)
+        self.dictionary_fields = [field for field in dictionary_fields if field in self.fields]
+        self.schema = pa.schema([
+            pa.field(field,
+                     pa.dictionary(pa.int32(), pa.string())
+                     if field in self.dictionary_fields else pa.string())
+            for field in self.fields
+        ])
+
+        self.buffer = []
+        self.n_written = 0
+        self.error = None
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.writer_thread = threading.Thread(target=self.run_writer, daemon=True)
+        self.writer_thread.start()
+    
+    
+    def write(self, jobinfo):
+        if self.error is not None:
+            raise self.error
+        self.buffer.append(jobinfo)
+        if len(self.buffer) >= self.row_group_size:
+            self.queue.put(self.buffer)
+            self.buffer = []
+    
+    
+    # Turns a chunk of records (JobRecords or dicts) into a pa.Table
+    # with self.schema (see records.records_to_batch()).
+    def to_table(self, chunk):
+        import pyarrow as pa
+
+        batch = records_to_batch(chunk, self.fields, self.dictionary_fields)
+        return pa.Table.from_batches([batch], schema=self.schema)
+    
+    
+    # Runs on the writer thread until it receives the None sentinel.
+    def run_writer(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            if self.file_format == "parquet":
+                writer = pq.ParquetWriter(self.path,
+                                          self.schema,
+                                          use_dictionary=self.dictionary_fields)
+            else:
+                writer = pa.ipc.new_stream(self.path, self.schema)
+            
+            while True:
+                chunk = self.queue.get()
+                if chunk is None:
+                    break
+                
+                table = self.to_table(chunk)
+                if self.file_format == "parquet":
+                    writer.write_table(table, row_group_size=self.row_group_size)
+                else:
+                    writer.write_table(table, max_chunksize=self.row_group_size)
+                self.n_written += len(chunk)
+
+        # Keep draining the queue so write() never blocks forever;
+        # the error is raised on the scraping thread.
+        except Exception as e:
+            self.error = e
+            while self.queue.get() is not None:
+                pass
+        finally:
+            if writer is not None:
+                writer.close()
+    
+    
+    def close(self):
+        if self.buffer:
+            self.queue.put(self.buffer)
+            self.buffer = []
+        self.queue.put(None)
+        self.writer_thread.join()
+        if self.error is not None:
+            raise self.error
@@ -1,12 +1,25 @@
 
 import re
 import time
-import pandas as pd
+import heapq
+
+from itertools import islice
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import ElementClickInterceptedException
 from selenium.webdriver.common.keys import Keys
 
 from elements import ConfigElements, WebScrapingElements
+from locators import WebScrapingLocators as WSL
+from seen_index import SeenJobIndex
+from governor import GOVERNOR
+from filter_urls import compile_filters_URL
+from filter_cache import FilterCache
+from lazy_filters import LazyFilters
+from records import JobRecord, jobs_to_frame
 
 
 class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
@@ -46,10 +59,19 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
         - update keyword and URL
         - set implicit wait
         - get
+        - start driver
+        - recycle driver
         - close
+        - quit
     - Filter Configuration Functions
         - clear filters
         - init filters
+        - refresh filter
+        - read filter
+        - read filters script
+        - cache filter
+        - get filter cache key
+        - load cached filter
         - init change filters
         - include no salary data
         - change *
@@ -67,7 +89,29 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
             > Easy Apply Only/Work From Home Only
             > rating
             > sortby
-    - Webscrape Function
+        - get filters URL
+        - apply filters
+    - Webscrape Functions
+        - extract job info
+        - get joblisting keys
+        - scrape joblisting
+        - report to governor
+        - get page URL
+        - get current page
+        - click next page
+        - go to page
+        - get tab preparer
+        - prefetch page
+        - switch to prefetched page
+        - discard prefetched page
+        - iter page jobs
+        - iter tab jobs
+        - refind joblisting
+        - get query
+        - resume from journal
+        - iter jobs
+        - scrape jobs
+        - scrape jobs to sink
 
     
     
@@ -79,14 +123,25 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
     set_implicitly_wait(implicitly_wait_time)
         Set the global implicit wait time.
         
-    get(implicitly_wait_time=5, set_implicitly_wait=True)
+    get(implicitly_wait_time=5, set_implicitly_wait=True, pool=None)
         Creates a webdriver, maximizes window, sets the implicit wait time
         (which defaults to 5) if set_implicitly_wait is true, then
-        finally opens the URL.
+        finally opens the URL. If pool (a session_pool.SessionPool) is given,
+        a warm webdriver is taken from it instead of starting a new one.
+        With a launch_profile (a launch_profile.LaunchProfile), Chrome is 
+        launched as the profile describes.
         
     close()
         Closes the current tab. This function is a wrapper just for 
         convenience.
+        
+    quit()
+        Quits the webdriver and closes every tab (or releases it back to
+        its pool).
+    
+    recycle_driver(page)
+        Restarts the webdriver on results page `page` of the query currently 
+        open, freeing the memory the old browser has built up.
     
     change_keyword_to(keyword)
         Enter keyword into the keyword search bar and return.
@@ -94,8 +149,12 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
     change_location_to(location)
         Enter location into the location search bar and return.
         
-    init_filters(_filter=None)
+    init_filters(_filter=None, refresh=False, use_script=True)
         Initialize all filters if _filter is None else initialize _filter.
+        With a filter_cache (a filter_cache.FilterCache), fresh cached filters 
+        are loaded instead of being read from the page unless refresh is True.
+        If use_script is True (the default), every dropdown filter is read 
+        in one scripted walk instead of a click, read and close per filter.
         
     reset_salary_slider(is_both=True, is_left=True)
         Reset salary slider. is_both decides if both sliders should be reset
@@ -156,8 +215,62 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
     sort_by(sort_type)
         Changes the "Most Relevant" dropdown (sortby) filter to a specified filter option.
         
-    scrape_jobs(n_jobs)
+    apply_filters(spec, URL=None)
+        Applies every filter of spec (a dict of filter name to option, see 
+        filter_urls.py) at once by opening the filtered URL instead of 
+        clicking through the dropdowns.
+        
+    extract_jobinfo(use_script=True)
+        Extract the job info of the joblisting currently open. use_script 
+        reads all the job info in one JavaScript round trip.
+        
+    iter_jobs(n_jobs=None, use_script=True, cards_only=False, pages=None, journal=None, 
+              seen_index=None, capture=None, dismiss_popups=True, recycle=None, n_tabs=1,
+              prefetch=False)
+        A generator that yields each job (a records.JobRecord; a dict with
+        cards_only or capture) as soon as it is scraped so results can be 
+        processed and saved incrementally. n_jobs=None
+        scrapes every page. Takes the same options as scrape_jobs.
+        
+    scrape_jobs(n_jobs, use_script=True, cards_only=False, pages=None, journal=None, 
+                seen_index=None, capture=None, dismiss_popups=True, recycle=None, n_tabs=1,
+                prefetch=False)
         Webscrape jobs. n_jobs determines the size of the dataset.
+        If cards_only is True, only the joblisting card fields (job id, 
+        job title, company, location, salary estimate, age, link) are 
+        harvested, one scripted call per page, without clicking any joblisting.
+        If pages is given, only those page numbers are scraped. If journal 
+        (a ScrapeJournal) is given, every job and completed page is checkpointed 
+        to disk and a restarted run resumes after the last completed page.
+        If seen_index (a SeenJobIndex) is given, joblistings scraped by earlier
+        runs are skipped before being clicked. If capture (a CaptureWriter) is
+        given, only each joblisting's JD_COL html is saved to disk, to be parsed
+        offline with capture.parse_captures(). If dismiss_popups is True, an
+        injected observer closes pop-ups as soon as they appear (call 
+        get_popup_dismissals() for the count) instead of checking after every click.
+        If recycle (a recycling.RecyclePolicy) is given, the browser is restarted
+        between pages every N jobs, every N pages or above a memory threshold, 
+        and continues on the next page. If n_tabs is more than 1, up to n_tabs
+        joblistings are loaded at once from their card links, each in its own 
+        tab of the same browser, and extracted as each tab becomes ready. If 
+        prefetch is True, the next results page loads in a background tab while
+        the current page is scraped, so turning the page doesn't wait on a load.
+        Instead of fixed sleeps, every click waits on a readiness signal
+        (see the seconds_before_*_timeout ceilings in WebScrapingElements).
+        Joblistings that fail to show ("try again") are retried at the end of
+        their page, up to max_retries times with exponential backoff.
+        Clicks are paced by the governor (a governor.RateGovernor), which
+        speeds up while joblistings render cleanly and backs off on try again 
+        banners, pop-ups and timeouts.
+        
+    go_to_page(page, URL=None)
+        Opens a results page directly by URL (falling back to clicking the
+        right arrow from page 1). iter_jobs uses it to jump to the pages, 
+        resumed pages and worker page ranges it scrapes.
+        
+    scrape_jobs_to_sink(sink, n_jobs=None, **kwargs)
+        Webscrape jobs straight into a sink (e.g. a sinks.ArrowSink writing
+        Parquet) as they are scraped. kwargs are the options of iter_jobs.
         
         
     This project was created with inspiration from:
@@ -165,8 +278,27 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
     https://github.com/arapfaik/scraping-glassdoor-selenium
     
     """     
+    
+    # Tunable parameters for retrying joblistings that fail to show
+    # (the number of retries and the first backoff in seconds, which
+    # doubles on every retry).
+    max_retries = 3
+    retry_backoff = 1.0
+    
+    # Paces every joblisting click and page turn (see governor.py).
+    # The default is shared by every scraper in the process so that 
+    # parallel scrapers back off together; set to None to disable pacing.
+    governor = GOVERNOR
+    
+    # The query parameter of the results page number, used to open
+    # a page directly instead of clicking through the pages before it.
+    page_parameter = "p"
      
-    def __init__(self, keyword, PATH="C:\Program Files (x86)\chromedriver.exe"):
+    def __init__(self, 
+                 keyword, 
+                 PATH="C:\Program Files (x86)\chromedriver.exe", 
+                 filter_cache=None, 
+                 launch_profile=None):
         """The following attributes can be accessed and changed but it is advised not to do so directly.
         
             All attributes of a GlassdoorWebScraper obj include:
@@ -197,9 +329,47 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
                 calls the get() method.
                 
                 
+            self.pool:
+                The SessionPool the driver was taken from by get(pool=...), if any.
+                
+                
+            self.implicitly_wait_time:
+                The implicit wait time last set, reapplied when the driver is recycled.
+                
+                
+            self.launch_profile:
+                An optional LaunchProfile that get() launches Chrome with, e.g. launch_profile.LEAN
+                (headless, eager page loads, no images, media or fonts, instant CSS animations).
+                If None, Chrome is launched windowed and maximized as before.
+                
+                
             self.filters:
                 A dictionary of dictionaries and lists. It contains all the configurable filters 
                 of the current opened webpage. Only created when the init_configs() method is called.
+                It is a LazyFilters dict: a filter invalidated by a later change_*_to is re-read
+                when it is next accessed by key.
+                
+                
+            self.filter_cache:
+                An optional FilterCache. If given, init_filters() loads filters from it instead of 
+                reading them from the page (unless they are stale) and caches the filters it reads.
+                change_filter_to() re-reads a filter whose cached options don't include the choice.
+                
+                
+            self.page_counter:
+                The page number of the results page currently being scraped. Only 
+                created when iter_jobs() or scrape_jobs() is called.
+                
+                
+            self.n_resumed_jobs:
+                The number of jobs committed to a ScrapeJournal by earlier runs of the 
+                query resumed by the last iter_jobs() or scrape_jobs() call.
+                
+                
+            self.previous_jdcol_text:
+                The job description column text of the previously scraped joblisting.
+                Rather than sleeping, each joblisting click waits until the job 
+                description column shows something different from this.
                 
                 
             self.get_join_filters:
@@ -220,7 +390,14 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
                              -1&employerSizes=0&applicationType=0&remoteWorkType=0'
         self.URL = self.URL_part_1 + self.keyword + self.URL_part_2
 
-        self.filters = {}
+        self.filters = LazyFilters(self.refresh_filter)
+        self.filter_cache = filter_cache
+        
+        self.previous_jdcol_text = None
+        self.n_resumed_jobs = 0
+        self.pool = None
+        self.launch_profile = launch_profile
+        self.implicitly_wait_time = None
         
         # Excludes company rating, easy apply only, work from home only, and the
         # most relevant (sortby) filters. 
@@ -316,19 +493,74 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
     # implicit wait time.
     def set_implicitly_wait(self, implicitly_wait_time):
         self.driver.implicitly_wait(implicitly_wait_time)
+        self.implicitly_wait_time = implicitly_wait_time
     
     
-    def get(self, implicitly_wait_time=5, set_implicitly_wait=True): 
-        self.driver = webdriver.Chrome(self.PATH)
+    # If a pool (SessionPool) is given, a warm driver is taken from it
+    # instead of starting a new Chrome. A driver still held from a pool 
+    # is released back to it first, so calling get() again doesn't hold 
+    # two of the pool's drivers.
+    def get(self, implicitly_wait_time=5, set_implicitly_wait=True, pool=None): 
+        held_pool = self.pool
+        if held_pool is not None:
+            self.quit()
+        self.pool = pool if pool is not None else held_pool
+        self.driver = self.start_driver()
         if set_implicitly_wait: self.set_implicitly_wait(implicitly_wait_time)
-        self.driver.maximize_window()
-        self.driver.get(self.URL)
+        
+        # Unless the page load strategy is normal, driver.get() returns 
+        # before the joblistings are rendered.
+        if self.launch_profile is not None and self.launch_profile.page_load_strategy != "normal":
+            self.load_page(self.URL)
+        else:
+            self.driver.get(self.URL)
+    
+    
+    # Takes a driver from the pool if there is one, else launches Chrome
+    # (with the launch_profile, if any).
+    def start_driver(self):
+        if self.pool is not None:
+            return self.pool.acquire()
+        if self.launch_profile is not None:
+            return self.launch_profile.create_driver(self.PATH)
+        driver = webdriver.Chrome(self.PATH)
+        driver.maximize_window()
+        return driver
+    
+    
+    # Quits the driver (a pooled driver is discarded, not released, so 
+    # its memory is freed) and starts a new one on results page `page`
+    # of the query URL currently open. Returns True if the page was reached.
+    def recycle_driver(self, page):
+        URL = self.driver.current_url
+        try:
+            if self.pool is not None:
+                self.pool.discard(self.driver)
+            else:
+                self.driver.quit()
+        except:
+            print("Cannot quit the recycled driver.")
+        
+        self.driver = self.start_driver()
+        if self.implicitly_wait_time is not None:
+            self.set_implicitly_wait(self.implicitly_wait_time)
+        self.previous_jdcol_text = None
+        return self.go_to_page(page, URL)
     
     
     def close(self):
         self.driver.close()
     
     
+    # A driver taken from a pool is released back to it, not quit.
+    def quit(self):
+        if self.pool is not None:
+            self.pool.release(self.driver)
+            self.pool = None
+        else:
+            self.driver.quit()
+    
+    
     
     # ==================================================
     # Filter Configuration Functions.
@@ -342,34 +574,116 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
             clear_filter_button.click()
         except:
             print("Cannot clear filters.")
+        self.filters.mark_changed()
     
     
     # Initialize all filter configurations and allows for initializing specific filters.
     # Note: filters change when other filters are updated.
     # Note: Make sure to glance the self.filters attribute and call init_filters() on 
     # the filter that will be next changed.
-    def init_filters(self, _filter=None):
-        if not _filter:
-            for filters, attribs in self.get_join_filters.items():
-                self.init_filter(name=filters, 
-                                 get_filters_=attribs["get"], 
-                                 join_filters_=attribs["join"],
-                                 is_salary=attribs["is_salary"],
-                                 is_more=attribs["is_more"])
-            
-            self.init_sortby()
-            
+    # Note: with a filter_cache, filters cached less than its ttl ago are
+    # loaded from it without touching the page unless refresh is True.
+    # Note: if use_script is True, the dropdown filters are read in one 
+    # scripted walk; the salary filter and any filter the walk misses 
+    # are read one at a time.
+    def init_filters(self, _filter=None, refresh=False, use_script=True):
+        requested_names = [_filter] if _filter else list(self.get_join_filters) + ["sortbys"]
+        if self.read_filters(requested_names, refresh, use_script) and not _filter:
             self.click_more_dropdown(n_clicks=2)
-        elif _filter:
-            if _filter == "sortbys":
-                self.init_sortby()
-            else:
-                attribs = self.get_join_filters[_filter]
-                self.init_filter(name=_filter,
-                                 get_filters_=attribs["get"],
-                                 join_filters_=attribs["join"],
-                                 is_salary=attribs["is_salary"],
-                                 is_more=attribs["is_more"])
+    
+    
+    # Loads names from the filter_cache (unless refresh is True) and reads
+    # the rest from the page. Returns True if any filter was read from the page.
+    def read_filters(self, names, refresh=False, use_script=True):
+        key = self.get_filter_cache_key()
+        names = [name for name in names 
+                 if refresh or not self.load_cached_filter(name, key)]
+        
+        if names:
+            unread_names = self.read_filters_script(names, key) if use_script else names
+            for name in unread_names:
+                self.read_filter(name, key)
+        return bool(names)
+    
+    
+    # Re-reads a filter invalidated by a filter change (called by
+    # self.filters when the filter is next accessed). The other stale
+    # dropdown filters are re-read in the same scripted walk; the salary 
+    # filter is only re-read when it is the one accessed.
+    # Note: refresh skips the filter_cache, which may still hold the 
+    # options the change invalidated.
+    def refresh_filter(self, name):
+        names = [name] + [stale_name for stale_name in self.filters.stale
+                          if stale_name == "sortbys" or not self.get_join_filters[stale_name]["is_salary"]]
+        self.read_filters(names, refresh=True)
+    
+    
+    # Reads a single filter from the page and caches it.
+    def read_filter(self, name, key=None):
+        previous_options = self.filters.peek(name)
+        if name == "sortbys":
+            self.init_sortby()
+        else:
+            attribs = self.get_join_filters[name]
+            self.init_filter(name=name,
+                             get_filters_=attribs["get"],
+                             join_filters_=attribs["join"],
+                             is_salary=attribs["is_salary"],
+                             is_more=attribs["is_more"])
+        
+        # init_filter() leaves the old options in place if it fails.
+        if self.filters.peek(name) is not previous_options:
+            self.cache_filter(name, key)
+    
+    
+    # Reads the dropdown filters of names in one scripted walk (see
+    # get_filter_texts_script) and caches them. Returns the names that
+    # were not read (the salary filter and any dropdown that didn't show).
+    def read_filters_script(self, names, key=None):
+        dropdown_names = [name for name in names 
+                          if name in self.get_join_filters and not self.get_join_filters[name]["is_salary"]]
+        try:
+            filter_texts = self.get_filter_texts_script(dropdown_names, "sortbys" in names)
+        except WebDriverException:
+            return names
+        
+        read_names = set()
+        for name, filter_text in filter_texts.items():
+            try:
+                if name == "sortbys":
+                    self.filters[name] = self.join_filters_sortby(filter_text)
+                else:
+                    self.filters[name] = self.get_and_parse_filters(filter_text, 
+                                                                    self.get_join_filters[name]["join"])
+            except:
+                continue
+            self.cache_filter(name, key)
+            read_names.add(name)
+        return [name for name in names if name not in read_names]
+    
+    
+    def cache_filter(self, name, key=None):
+        if self.filter_cache is not None:
+            self.filter_cache.put(key or self.get_filter_cache_key(), name, self.filters.peek(name))
+    
+    
+    # The filter_cache key of the query currently open.
+    def get_filter_cache_key(self):
+        if self.filter_cache is None:
+            return None
+        return FilterCache.cache_key(self.driver.current_url)
+    
+    
+    # Loads a filter from the filter_cache into self.filters. 
+    # Returns True if a fresh entry was found.
+    def load_cached_filter(self, name, key=None):
+        if self.filter_cache is None:
+            return False
+        options = self.filter_cache.get(key or self.get_filter_cache_key(), name)
+        if options is None:
+            return False
+        self.filters[name] = options
+        return True
         
         
     def reset_salary_slider(self, is_both=True, is_left=True):
@@ -412,6 +726,7 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
                 self.reset_salary_base_fn(slider, idx, key_fn, is_both=True)
             applybutton = self.get_filters_minsalaries_applybutton()
             applybutton.click()
+        self.filters.mark_changed()
         
         
         
@@ -501,12 +816,14 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
             applybutton.click()
         except:
             print("Cannot select include data with no salary checkbox.")
+        self.filters.mark_changed()
     
     
     # Change keyword (occupation).
     def change_keyword_to(self, keyword):
         keyword_search = self.get_keyword_search()
         self.clear_and_search(keyword_search, keyword)
+        self.filters.mark_changed()
         
     
     def change_location_to(self, location):
@@ -525,6 +842,7 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
         location_search.send_keys(location)
         search_button = self.get_search_button()
         search_button.click()
+        self.filters.mark_changed()
         
         
     def change_jobtype_to(self, jobtype):
@@ -549,7 +867,9 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
     # histogram, but might take a few clear_filters() and init_filters("salaries")
     # to work somewhat consistently for the chaotic histogram.
     def change_salary_to(self, begin_salary, end_salary):
-        
+        # Read the bins before opening the dropdown (a stale salary 
+        # filter is re-read on access, see LazyFilters).
+        salary_bins = self.filters["salaries"]
         
         salary_filter = self.get_filters_minsalaries()
         salary_filter.click()
@@ -572,8 +892,8 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
         # The next 4 blocks of code dictate how far the current left and right 
         # sliders are from the desired begin_salary (left slider) and 
         # end_salary (right slider).
-        left_slider_salaries = self.filters["salaries"]["left_slider"]
-        right_slider_salaries = self.filters["salaries"]["right_slider"]
+        left_slider_salaries = salary_bins["left_slider"]
+        right_slider_salaries = salary_bins["right_slider"]
         
         begin_salary = begin_salary.upper()
         end_salary = end_salary.upper()
@@ -606,9 +926,14 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
                          current_end_salary_idx,
                          end_salary_difference)
         
+        # Check both sliders with one header read (and correct them once).
+        if not self.verify_sliders(begin_salary_idx, end_salary_idx):
+            self.verify_sliders(begin_salary_idx, end_salary_idx)
+        
         # Finally, apply the changes.
         applybutton = self.get_filters_minsalaries_applybutton()
         applybutton.click()
+        self.filters.mark_changed()
         
         
     def change_radius_to(self, radius):
@@ -677,6 +1002,7 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
                 pass
         
         self.click_more_dropdown()
+        self.filters.mark_changed()
         
         
     def change_rating_to(self, rating):  # Rating goes from 1-4.
@@ -687,6 +1013,7 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
         ratings[rating - 1].click()
         
         self.click_more_dropdown()
+        self.filters.mark_changed()
         
         
     # The sort by dropdown seems to be a little bugged.
@@ -699,152 +1026,675 @@ class GlassdoorWebScraper(ConfigElements, WebScrapingElements):
     # Note: since this "filter" isn't a part of the DKFilters tag, it will not follow
     # the general pipeline for DKFilters for flexibility.
     def sort_by(self, sort_type):
+        sortbys = self.get_filters_by_type("sortbys")
+        
         sortby_filter = self.get_filters_sortby()
         sortby_filter.click()
         
         dropdown_ul_li = self.get_main_body_sortby_dropdown_ul_li()  
-        ul_li_element = dropdown_ul_li[self.get_filters_by_type("sortbys").index(sort_type)]
+        ul_li_element = dropdown_ul_li[sortbys.index(sort_type)]
         ul_li_element.click()
+        self.filters.mark_changed()
+    
+    
+    # The URL (defaults to self.URL) with the filters of spec applied.
+    # Options are checked against self.filters for the filters that
+    # have been initialized.
+    def get_filters_URL(self, spec, URL=None):
+        return compile_filters_URL(URL or self.URL, spec, self.filters.peek_all())
+    
+    
+    # Applies every filter of spec with a single page load.
+    # Note: spec replaces the filters applied so far (it is compiled 
+    # onto self.URL, not onto the URL currently open) unless the
+    # current URL is passed as URL.
+    def apply_filters(self, spec, URL=None):
+        self.load_page(self.get_filters_URL(spec, URL))
+        self.filters.mark_changed()
     
     
     
     # ==================================================
-    # Webscraping Function.
+    # Webscraping Functions.
     # ==================================================
     
     
     
-    def scrape_jobs(self, n_jobs):
-        # Gets the total number of pages.
-        total_pages = int(self.get_page_count().text.split()[-1])
-        page_counter = 1
-        jobs = []
+    # Extracts the job info 1-4 of the joblisting open in JD_COL 
+    # as a JobRecord.
+    # If use_script is True, all 4 groups are read in a single
+    # execute_script round trip instead of ~15-20 WebDriver calls;
+    # if the script fails, it falls back to the WebElement getters.
+    def extract_jobinfo(self, use_script=True):
+        jobinfo_texts = None
+        if use_script:
+            try:
+                jobinfo_texts = self.get_jobinfo_script()
+            except WebDriverException:
+                jobinfo_texts = None
+        if not jobinfo_texts:
+            jobinfo_texts = self.get_jobinfo_texts()
+        return self.parse_jobinfo(jobinfo_texts)
+    
+    
+    # Gets the seen_index key of every joblisting on the page, in page order.
+    # Falls back to reading each li's job id attribute if the cards
+    # don't line up with the joblistings.
+    def get_joblisting_keys(self, joblistings):
+        cards = self.get_joblisting_cards()
+        if len(cards) != len(joblistings):
+            cards = [{"job id": joblisting.get_attribute(WSL.CARD_JOB_ID_ATTR)} 
+                     for joblisting in joblistings]
+        return [SeenJobIndex.seen_key(card) for card in cards]
+    
+    
+    # Clicks a joblisting and extracts it (or captures its JD_COL html if 
+    # a capture is given). Returns None if the joblisting failed to show 
+    # (Glassdoor's "try again" banner); the banner's button is clicked so 
+    # that the joblisting can be retried.
+    def scrape_joblisting(self, 
+                          joblisting, 
+                          key=None, 
+                          use_script=True, 
+                          capture=None, 
+                          dismiss_popups=False):
+        if self.governor is not None:
+            self.governor.acquire()
+        outcome = "success"
         
         try:
-            while len(jobs) < n_jobs and page_counter <= total_pages:
-                time.sleep(2)
-
-                joblistings = self.get_joblistings()
-
-                for joblisting in joblistings:
-                    if len(jobs) == n_jobs:
-                        break
-
-                    joblisting.click()
+            joblisting.click()
+        except ElementClickInterceptedException:
+            # Something (usually a late pop-up) covers the joblisting,
+            # so the pop-up is now expected and worth waiting for.
+            self.report_to_governor("popup")
+            try:
+                close_popup_btn = self.close_popup()
+                close_popup_btn.click()
+                self.wait_until_stale(close_popup_btn)
+            except:
+                pass
+            joblisting.click()
 
-                    time.sleep(2)
+        # Wait for the clicked joblisting to render in JD_COL.
+        # On timeout, keep the old text so the next wait 
+        # still compares against a real joblisting.
+        jdcol_text = self.wait_until_listing_ready(self.previous_jdcol_text)
+        if jdcol_text is None:
+            outcome = "timeout"
+        self.previous_jdcol_text = jdcol_text or self.previous_jdcol_text
 
-                    # Check if there is a pop-up.
+        # Check if there is a pop-up.
+        # Probes return immediately when there is none instead of 
+        # waiting out a timeout on every joblisting.
+        if not dismiss_popups:
+            try:
+                close_popup_btn = self.probe_popup()
+                if close_popup_btn is not None:
+                    self.report_to_governor("popup")
+                    close_popup_btn.click()
+                    self.wait_until_stale(close_popup_btn)
+            except:
+                pass
+    
+        # Check if there is a "try again" button.
+        try:
+            try_again_btn = self.probe_try_again_btn()
+        except:
+            try_again_btn = None
+        if try_again_btn is not None:
+            try:
+                try_again_btn.click()
+                self.wait_until_stale(try_again_btn)
+            except:
+                pass
+            self.report_to_governor("try_again")
+            return None
+        
+        self.report_to_governor(outcome)
+        if capture is not None:
+            capture.write(self.page_counter, key, self.get_jdcol_html())
+            return {"page": self.page_counter, "job key": key}
+        return self.extract_jobinfo(use_script)
+    
+    
+    # Reports how a click went ("success" or one of the error kinds of 
+    # the governor) to the rate governor, if there is one.
+    def report_to_governor(self, outcome, n=1):
+        if self.governor is None:
+            return
+        if outcome == "success":
+            self.governor.record_success()
+        else:
+            self.governor.record_error(outcome, n)
+    
+    
+    # The URL of results page `page` of URL, which defaults to the URL
+    # currently open (so filters applied through the UI are kept).
+    def get_page_URL(self, page, URL=None):
+        scheme, netloc, path, query, fragment = urlsplit(URL or self.driver.current_url)
+        params = [(name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+                  if name != self.page_parameter]
+        params.append((self.page_parameter, str(page)))
+        return urlunsplit((scheme, netloc, path, urlencode(params), fragment))
+    
+    
+    # The page number shown in the footer ("Page 2 of 30"), or None 
+    # if it cannot be read.
+    def get_current_page(self):
+        try:
+            return int(self.get_page_count().text.split()[1])
+        except:
+            return None
+    
+    
+    # Clicks the right arrow in the page navigator footer and waits for 
+    # the MainCol joblistings to re-render. Returns the new joblistings.
+    def click_next_page(self, previous_listing=None):
+        if self.governor is not None:
+            self.governor.acquire()
+        try:
+            page_nav_right_arrow = self.get_page_nav()[6]
+            page_nav_right_arrow.click()
+        except:
+            pass
+        
+        joblistings = self.wait_until_page_ready(previous_listing)
+        if not joblistings:
+            self.report_to_governor("timeout")
+        return joblistings
+    
+    
+    # Opens results page `page` of URL (defaults to the URL currently open)
+    # instead of clicking through every page before it. If the URL doesn't 
+    # land on the page, falls back to clicking the right arrow from page 1. 
+    # Returns True (and sets page_counter) if the page was reached.
+    def go_to_page(self, page, URL=None):
+        if self.governor is not None:
+            self.governor.acquire()
+        self.load_page(self.get_page_URL(page, URL))
+        
+        current_page = self.get_current_page()
+        if current_page is not None and current_page != page:
+            joblistings = self.load_page(self.get_page_URL(1, URL))
+            for _ in range(page - 1):
+                joblistings = self.click_next_page(joblistings[0] if joblistings else None)
+            current_page = self.get_current_page()
+        
+        if current_page is not None and current_page != page:
+            return False
+        self.page_counter = page
+        return True
+    
+    
+    # The function that sets up a new tab as the launch_profile would
+    # have set up the first one (None if there is nothing to set up).
+    def get_tab_preparer(self):
+        if self.launch_profile is None:
+            return None
+        return self.launch_profile.prepare
+    
+    
+    # Starts loading results page `page` of the query currently open in 
+    # a background tab. Returns the tab's window handle, or None if it
+    # couldn't be opened.
+    def prefetch_page(self, page):
+        if self.governor is not None:
+            self.governor.acquire()
+        try:
+            return self.open_tab(self.get_page_URL(page), self.get_tab_preparer())
+        except WebDriverException:
+            return None
+    
+    
+    # Closes the tab currently open and carries on in the tab results page
+    # `page` was prefetched in. Falls back to go_to_page() if the prefetched
+    # tab didn't land on the page. Returns True (and sets page_counter) if 
+    # the page was reached.
+    def switch_to_prefetched_page(self, page, handle):
+        self.close_tab(self.driver.current_window_handle)
+        self.driver.switch_to.window(handle)
+        joblistings = self.wait_until_page_ready()
+        
+        current_page = self.get_current_page()
+        if not joblistings or (current_page is not None and current_page != page):
+            self.report_to_governor("timeout")
+            return self.go_to_page(page)
+        self.page_counter = page
+        return True
+    
+    
+    # Closes a prefetched page that won't be scraped.
+    def discard_prefetched_page(self, handle):
+        main_handle = self.driver.current_window_handle
+        try:
+            self.close_tab(handle)
+        except WebDriverException:
+            pass
+        self.driver.switch_to.window(main_handle)
+    
+    
+    # Yields the jobs of the page currently open, in page order.
+    # If a seen_index (SeenJobIndex) is given, joblistings already in it 
+    # are skipped before they are clicked and new ones are added to it.
+    # If a capture (CaptureWriter) is given, only the JD_COL html of each 
+    # joblisting is saved for offline parsing (see capture.py) and a
+    # {"page", "job key"} dict is yielded instead of the job info.
+    # If dismiss_popups is True, pop-ups are left to the observer 
+    # installed by iter_jobs() and are not checked for here.
+    # Joblistings that fail to show are put in a retry queue and retried
+    # (up to max_retries times, with exponential backoff starting at
+    # retry_backoff seconds) once the rest of the page is done.
+    # If n_tabs is more than 1, joblistings are first loaded n_tabs at a 
+    # time from their card links (see iter_tab_jobs); only the ones that
+    # fail to load there are clicked.
+    def iter_page_jobs(self, 
+                       joblistings, 
+                       use_script=True, 
+                       cards_only=False, 
+                       seen_index=None, 
+                       capture=None,
+                       dismiss_popups=False,
+                       n_tabs=1):
+        
+        # Harvest the whole page's cards at once and skip the clicks.
+        if cards_only:
+            for card in self.get_joblisting_cards():
+                key = SeenJobIndex.seen_key(card) if seen_index is not None else None
+                if key is not None:
+                    if key in seen_index:
+                        continue
+                    seen_index.add(key)
+                yield card
+            return
+        
+        if seen_index is not None or capture is not None:
+            keys = self.get_joblisting_keys(joblistings)
+        else:
+            keys = [None] * len(joblistings)
+        
+        to_click = range(len(joblistings))
+        if n_tabs > 1:
+            to_click = yield from self.iter_tab_jobs(joblistings, keys, n_tabs, use_script, seen_index, capture)
+        
+        # Entries are [ready_at, attempt, idx, joblisting, key].
+        retry_queue = []
+        
+        for idx, (joblisting, key) in enumerate(zip(joblistings, keys)):
+            if idx not in to_click:
+                continue
+            if seen_index is not None and key is not None and key in seen_index:
+                continue
+            
+            # A stale li or a click that is intercepted again is retried
+            # like a joblisting that failed to show.
+            try:
+                jobinfo = self.scrape_joblisting(joblisting, key, use_script, capture, dismiss_popups)
+            except WebDriverException:
+                jobinfo = None
+            if jobinfo is None:
+                heapq.heappush(retry_queue, [time.monotonic() + self.retry_backoff, 1, idx, joblisting, key])
+                continue
+            
+            if seen_index is not None and key is not None:
+                seen_index.add(key)
+            yield jobinfo
+        
+        # Drain the retry queue, soonest ready first.
+        while retry_queue:
+            ready_at, attempt, idx, joblisting, key = heapq.heappop(retry_queue)
+            time.sleep(max(0, ready_at - time.monotonic()))
+            
+            try:
+                jobinfo = self.scrape_joblisting(joblisting, key, use_script, capture, dismiss_popups)
+            except StaleElementReferenceException:
+                jobinfo = None
+                joblisting = self.refind_joblisting(idx, joblisting)
+            except WebDriverException:
+                jobinfo = None
+            if jobinfo is None:
+                if attempt < self.max_retries:
+                    backoff = self.retry_backoff * 2 ** attempt
+                    heapq.heappush(retry_queue, 
+                                   [time.monotonic() + backoff, attempt + 1, idx, joblisting, key])
+                else:
+                    print(f"Cannot scrape joblisting {idx + 1} of page {self.page_counter}.")
+                continue
+            
+            if seen_index is not None and key is not None:
+                seen_index.add(key)
+            yield jobinfo
+    
+    
+    # Loads the joblistings of the page currently open from their card 
+    # links, up to n_tabs at a time, each in its own tab of this driver, 
+    # and yields each job as soon as its tab is ready (so not in page 
+    # order). Tabs are polled in turn; a tab that isn't ready within
+    # seconds_before_page_timeout is closed. Returns (as the value of 
+    # yield from) the indices of the joblistings left to click: the ones
+    # without a link, the ones that timed out, or all of them if the cards 
+    # don't line up with joblistings.
+    def iter_tab_jobs(self, joblistings, keys, n_tabs, use_script=True, seen_index=None, capture=None):
+        cards = self.get_joblisting_cards()
+        if len(cards) != len(joblistings):
+            return range(len(joblistings))
+        
+        to_click = []
+        pending = []
+        for idx, (card, key) in enumerate(zip(cards, keys)):
+            if seen_index is not None and key is not None and key in seen_index:
+                continue
+            if card.get("link"):
+                pending.append((idx, card["link"], key))
+            else:
+                to_click.append(idx)
+        pending.reverse()
+        
+        main_handle = self.driver.current_window_handle
+        
+        # Maps each open tab's handle to (idx, key, opened_at).
+        tabs = {}
+        try:
+            while pending or tabs:
+                while pending and len(tabs) < n_tabs:
+                    idx, link, key = pending.pop()
+                    if self.governor is not None:
+                        self.governor.acquire()
+                    handle = self.open_tab(link, self.get_tab_preparer())
+                    if handle is None:
+                        to_click.append(idx)
+                    else:
+                        tabs[handle] = (idx, key, time.monotonic())
+                
+                # Visit every tab once and extract the ones that are ready.
+                jobs = []
+                for handle, (idx, key, opened_at) in list(tabs.items()):
                     try:
-                        close_popup_btn = self.close_popup()
-                        close_popup_btn.click()
-                    except:
-                        pass
-
-                    time.sleep(2)
+                        self.driver.switch_to.window(handle)
+                        jobinfo_texts = self.get_jobinfo_script()
+                    except WebDriverException:
+                        jobinfo_texts = None
                     
-                    # Check if there is a "try again" button.
-                    try:
-                        try_again_btn = self.get_try_again_btn()
-                        try_again_btn.click()
-                        time.sleep(2)
-                        break
-                    except:
-                        pass
+                    is_ready = bool(jobinfo_texts and jobinfo_texts.get("jobinfo4"))
+                    if not is_ready and time.monotonic() - opened_at < self.seconds_before_page_timeout:
+                        continue
+                    
+                    if not is_ready:
+                        self.report_to_governor("timeout")
+                        to_click.append(idx)
+                    else:
+                        self.report_to_governor("success")
+                        if capture is not None:
+                            capture.write(self.page_counter, key, self.get_jdcol_html())
+                            jobs.append(({"page": self.page_counter, "job key": key}, key))
+                        elif use_script:
+                            jobs.append((self.parse_jobinfo(jobinfo_texts), key))
+                        else:
+                            jobs.append((self.extract_jobinfo(use_script=False), key))
                     
-                    jobinfo = {}
-
-                    # Job Info I.
-                    jobinfo1 = self.get_jobinfo1()
-
-                    try:
-                        company = jobinfo1[0].text
-                    except:
-                        company = -1
-                    try:
-                        job_title = jobinfo1[1].text
-                    except:
-                        job_title = -1
-                    try:
-                        headquarters = jobinfo1[2].text
-                    except:
-                        headquarters = -1
-                    try:
-                        salary_estimate = jobinfo1[3].text
-                    except:
-                        salary_estimate = -1
-
-                    jobinfo1_features = {
-                        "company": company,
-                        "job title": job_title,
-                        "headquarters": headquarters,
-                        "salary estimate": salary_estimate
-                    }
-
-                    # Job Info II.
-                    jobinfo2 = self.get_jobinfo2()
-
-                    try:
-                        job_type = jobinfo2[0].text
-                    except:
-                        job_type = -1
-
-                    jobinfo2_features = {
-                        "job type": job_type
-                    }
-
-                    # Job Info III.
-                    try:
-                        jobinfo3 = self.get_jobinfo3()
-                    except:
-                        pass
-
-                    jobinfo3_features = {
-                        "size": -1,
-                        "founded": -1,
-                        "type": -1,
-                        "industry": -1,
-                        "sector": -1,
-                        "revenue": -1
-                    }
-
                     try:
-                        # The text is a string, split by "\n", it will 
-                        # be a list with every value an attribute and every other
-                        # value corresponding to a value.
-                        jobinfo3_features_updated = {}
-                        features_list = jobinfo3.text.lower().split("\n")
-                        for i in range(0, len(features_list)-1, 2):
-                            jobinfo3_features_updated[features_list[i]] = features_list[i + 1]
-                    except:
+                        self.close_tab(handle)
+                    except WebDriverException:
                         pass
-
-                    jobinfo3_features.update(jobinfo3_features_updated)
-
-                    # Job Info IV.
-                    jobinfo4_features = {"job description": self.get_jobinfo4().text}
-
-                    for jobinfo_features in [jobinfo1_features, 
-                                    jobinfo2_features, 
-                                    jobinfo3_features, 
-                                    jobinfo4_features]:
-                        jobinfo.update(jobinfo_features)
-
-                    jobs.append(jobinfo)
-
-                if len(jobs) == n_jobs:
-                    break
-
-                # Clicks the right arrow in the page navigator footer.
+                    del tabs[handle]
+                self.driver.switch_to.window(main_handle)
+                
+                for jobinfo, key in jobs:
+                    if seen_index is not None and key is not None:
+                        seen_index.add(key)
+                    yield jobinfo
+                if not jobs and tabs:
+                    time.sleep(self.poll_frequency)
+        finally:
+            for handle in tabs:
                 try:
-                    page_nav_right_arrow = self.get_page_nav()[6]
-                    page_nav_right_arrow.click()
-                except:
+                    self.close_tab(handle)
+                except WebDriverException:
                     pass
-
-                page_counter += 1
+            self.driver.switch_to.window(main_handle)
+        
+        return sorted(to_click)
+    
+    
+    # The joblisting li at idx of the page as it is now (e.g. after the
+    # list was re-rendered), or joblisting if it cannot be found.
+    def refind_joblisting(self, idx, joblisting):
+        try:
+            joblistings = self.get_joblistings()
+        except WebDriverException:
+            return joblisting
+        return joblistings[idx] if idx < len(joblistings) else joblisting
+    
+    
+    # The query being scraped, as recorded in a ScrapeJournal.
+    def get_query(self):
+        return {
+            "keyword": self.keyword,
+            "URL": self.URL,
+            "current_url": self.driver.current_url,
+            "filters": self.filters
+        }
+    
+    
+    # Picks up where the last run of the same query left off.
+    # Returns the first page to scrape and the number of jobs already 
+    # committed; starts a new journal section if the query is new.
+    def resume_from_journal(self, journal):
+        query = self.get_query()
+        state = journal.load()
+        if not journal.matches(query, state):
+            journal.begin_query(query)
+            return 1, 0
+        return state["page_counter"] + 1, state["n_jobs"]
+    
+    
+    # Yields each job as soon as it is extracted.
+    # n_jobs=None scrapes until the last page. pages, if given, is the 
+    # collection of page numbers to scrape; pages that aren't next to 
+    # each other are opened directly (see go_to_page). If a journal (ScrapeJournal) is given, every job and 
+    # completed page is recorded to it and pages committed by an earlier
+    # run of the same query are skipped (their jobs count towards n_jobs).
+    # If a seen_index (SeenJobIndex) is given, joblistings scraped by any 
+    # earlier run are skipped without being clicked. If a capture 
+    # (CaptureWriter) is given, joblistings are captured, not extracted.
+    # If dismiss_popups is True, a pop-up observer is injected on every
+    # page load (see install_popup_observer) instead of polling for the 
+    # pop-up after every click. If a recycle (RecyclePolicy) is given, the
+    # driver is recycled between pages whenever the policy is due. If 
+    # n_tabs is more than 1, joblistings are loaded n_tabs at a time in 
+    # tabs of this driver instead of being clicked one by one. If prefetch
+    # is True, the next page is loaded in a background tab while the 
+    # current page is scraped, and swapped in once it is done.
+    # Scraping stops if the next page to scrape can't be reached.
+    def iter_jobs(self, 
+                  n_jobs=None, 
+                  use_script=True, 
+                  cards_only=False, 
+                  pages=None, 
+                  journal=None, 
+                  seen_index=None, 
+                  capture=None,
+                  dismiss_popups=True,
+                  recycle=None,
+                  n_tabs=1,
+                  prefetch=False):
+        self.n_resumed_jobs = 0
+        
+        # Gets the total number of pages.
+        total_pages = int(self.get_page_count().text.split()[-1])
+        if pages is not None:
+            pages = set(pages)
+            total_pages = min(total_pages, max(pages, default=0))
+        self.page_counter = 1
+        n_scraped = 0
+        
+        start_page = 1
+        if journal is not None:
+            start_page, self.n_resumed_jobs = self.resume_from_journal(journal)
+            n_scraped = self.n_resumed_jobs
+        
+        # The next page to scrape after `page` (past total_pages if none).
+        def next_page_after(page):
+            if pages is None:
+                return max(page + 1, start_page)
+            return min((p for p in pages if p > page and p >= start_page), default=total_pages + 1)
+        
+        # Jump straight to the first page to scrape.
+        first_page = next_page_after(0)
+        if first_page > total_pages or (n_jobs is not None and n_scraped >= n_jobs):
+            return
+        if first_page > 1 and not self.go_to_page(first_page):
+            print(f"Cannot go to page {first_page}.")
+            return
+        
+        # The observer's running count of dismissed pop-ups in this tab,
+        # to report the pop-ups of each page to the governor.
+        n_dismissals = 0
+        
+        # The handle of the tab the next page is prefetched in, if any.
+        prefetched_page, prefetched_handle = None, None
+        
+        try:
+            while (n_jobs is None or n_scraped < n_jobs) and self.page_counter <= total_pages:
+                joblistings = self.get_joblistings()
+                n_page_scraped = n_scraped
+                if journal is not None:
+                    journal.begin_page(self.page_counter)
+                
+                if dismiss_popups:
+                    try:
+                        self.install_popup_observer()
+                        n_dismissals = self.get_popup_dismissals() or 0
+                    except WebDriverException:
+                        dismiss_popups = False
+                
+                # Start loading the next page while this one is scraped.
+                next_page = next_page_after(self.page_counter)
+                if prefetch and next_page <= total_pages:
+                    prefetched_page = next_page
+                    prefetched_handle = self.prefetch_page(next_page)
+                
+                for jobinfo in self.iter_page_jobs(joblistings, 
+                                                   use_script, 
+                                                   cards_only, 
+                                                   seen_index, 
+                                                   capture,
+                                                   dismiss_popups,
+                                                   n_tabs):
+                    n_scraped += 1
+                    if journal is not None:
+                        journal.record_job(self.page_counter, jobinfo)
+                    yield jobinfo
+                    if n_scraped == n_jobs:
+                        return
+                
+                if journal is not None:
+                    journal.commit_page(self.page_counter)
+                if seen_index is not None:
+                    seen_index.commit()
+                
+                if dismiss_popups:
+                    try:
+                        n_page_dismissals = (self.get_popup_dismissals() or 0) - n_dismissals
+                        if n_page_dismissals > 0:
+                            self.report_to_governor("popup", n_page_dismissals)
+                    except WebDriverException:
+                        pass
+                
+                # The next page is one click away; any further page (or
+                # the next one if the click doesn't render it) is opened by
+                # its URL. A recycled driver opens it by URL too.
+                next_page = next_page_after(self.page_counter)
+                if next_page > total_pages:
+                    return
+                if recycle is not None:
+                    recycle.record_page(n_scraped - n_page_scraped)
+                if recycle is not None and recycle.is_due(self.driver):
+                    is_reached = self.recycle_driver(next_page)
+                    recycle.reset()
+                    prefetched_handle = None
+                elif prefetched_handle is not None and prefetched_page == next_page:
+                    is_reached = self.switch_to_prefetched_page(next_page, prefetched_handle)
+                    prefetched_handle = None
+                elif (next_page == self.page_counter + 1 
+                      and self.click_next_page(joblistings[0] if joblistings else None)):
+                    self.page_counter += 1
+                    is_reached = True
+                else:
+                    is_reached = self.go_to_page(next_page)
+                
+                # Scraping the wrong page would record its jobs under 
+                # next_page, so stop (a journal resumes from next_page).
+                if not is_reached:
+                    print(f"Cannot go to page {next_page}.")
+                    return
+        finally:
+            if prefetched_handle is not None:
+                self.discard_prefetched_page(prefetched_handle)
             
+            # Keys of a page cut off part way (by n_jobs, an error or the 
+            # caller stopping) follow the journal: the page is scraped again
+            # on resume, so they are dropped. Without a journal the jobs 
+            # were delivered, so they are kept.
+            if seen_index is not None:
+                if journal is not None:
+                    seen_index.rollback()
+                else:
+                    seen_index.commit()
+    
+    
+    # Collects iter_jobs() into a DataFrame (string dtype columns for 
+    # JobRecords, missing features are <NA>). If scraping fails part way,
+    # the jobs scraped so far are returned. With a journal, the jobs 
+    # committed by earlier runs of the same query come first.
+    def scrape_jobs(self, 
+                    n_jobs, 
+                    use_script=True, 
+                    cards_only=False, 
+                    pages=None, 
+                    journal=None, 
+                    seen_index=None, 
+                    capture=None,
+                    dismiss_popups=True,
+                    recycle=None,
+                    n_tabs=1,
+                    prefetch=False):
+        jobs = []
+        try:
+            for jobinfo in self.iter_jobs(n_jobs, 
+                                          use_script, 
+                                          cards_only, 
+                                          pages, 
+                                          journal, 
+                                          seen_index, 
+                                          capture,
+                                          dismiss_popups,
+                                          recycle,
+                                          n_tabs,
+                                          prefetch):
+                jobs.append(jobinfo)
+        except:
+            pass
+        # A journal may hold more jobs than n_jobs asks for.
+        n_resumed_jobs = self.n_resumed_jobs if n_jobs is None else min(self.n_resumed_jobs, n_jobs)
+        if journal is not None and n_resumed_jobs:
+            resumed_jobs = [JobRecord.from_dict(job) if job.keys() == JobRecord.FEATURES.keys() else job
+                            for job in islice(journal.committed_jobs(), n_resumed_jobs)]
+            jobs = resumed_jobs + jobs
+        return jobs_to_frame(jobs)
+    
+    
+    # Streams iter_jobs() into a sink (e.g. sinks.ArrowSink) instead of
+    # a DataFrame, so memory stays flat however many jobs are scraped.
+    # kwargs are passed on to iter_jobs(). The sink is not closed here;
+    # returns the number of jobs written.
+    def scrape_jobs_to_sink(self, sink, n_jobs=None, **kwargs):
+        n_written = 0
+        try:
+            for jobinfo in self.iter_jobs(n_jobs, **kwargs):
+                sink.write(jobinfo)
+                n_written += 1
         except:
-            return pd.DataFrame(jobs)
-        return pd.DataFrame(jobs)
+            print(f"Stopped scraping after {n_written} jobs.")
+        return n_written
     
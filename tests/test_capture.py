@@ -0,0 +1,66 @@
+import os
+import gzip
+
+from capture import CaptureWriter, read_captures, session_paths
+
+
+def write_snapshots(writer, page, n):
+    for idx in range(n):
+        writer.write(page, f"{page}-{idx}", f"<div id='JDCol'>{page}-{idx}</div>")
+
+
+def crash(writer):
+    # The file as a crash would leave it: sync flushed, but no trailer.
+    with open(writer.path, "rb") as f:
+        data = f.read()
+    writer.close()
+    with open(writer.path, "wb") as f:
+        f.write(data)
+
+
+def keys(path):
+    return [snapshot["job key"] for snapshot in read_captures(str(path))]
+
+
+def test_resume_after_crash(tmp_path):
+    path = str(tmp_path / "captures.jsonl.gz")
+    writer = CaptureWriter(path)
+    write_snapshots(writer, 1, 3)
+    crash(writer)
+
+    writer = CaptureWriter(path)
+    assert writer.path == str(tmp_path / "captures.1.jsonl.gz")
+    write_snapshots(writer, 2, 3)
+    writer.close()
+
+    assert session_paths(path) == [path, writer.path]
+    assert keys(path) == ["1-0", "1-1", "1-2", "2-0", "2-1", "2-2"]
+
+
+def test_truncated_and_corrupt_files_keep_earlier_snapshots(tmp_path):
+    path = str(tmp_path / "captures.jsonl.gz")
+    writer = CaptureWriter(path)
+    write_snapshots(writer, 1, 200)
+    crash(writer)
+    size = os.path.getsize(path)
+
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:size - 10])
+    assert keys(path)[:150] == [f"1-{idx}" for idx in range(150)]
+
+    # A file appended to after a crash (as older writers did).
+    with open(path, "wb") as f:
+        f.write(data)
+    with gzip.open(path, "ab") as f:
+        f.write(b'{"job key": "2-0"}\n')
+    assert keys(path) == [f"1-{idx}" for idx in range(200)]
+
+
+def test_multi_member_file(tmp_path):
+    path = str(tmp_path / "captures.jsonl.gz")
+    for page in [1, 2]:
+        with gzip.open(path, "ab") as f:
+            f.write(f'{{"job key": "{page}-0"}}\n'.encode("utf-8"))
+    assert keys(path) == ["1-0", "2-0"]
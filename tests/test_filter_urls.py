@@ -0,0 +1,58 @@
+from urllib.parse import urlsplit, parse_qsl
+
+import pytest
+
+from filter_urls import compile_filters_URL, companysize_value, seniority_value
+from webscraper import GlassdoorWebScraper
+
+
+URL = GlassdoorWebScraper("data scientist").URL
+
+
+def query_params(URL):
+    return dict(parse_qsl(urlsplit(URL).query, keep_blank_values=True))
+
+
+def test_companysize_value():
+    options = ["all_company_sizes", "1_to_50_employees", "51_to_200_employees", "201_to_500_employees",
+               "501_to_1000_employees", "1001_to_5000_employees", "5001_to_10000_employees", "10000_employees"]
+    assert [companysize_value(option) for option in options] == [0, 1, 2, 3, 4, 5, 6, 7]
+
+
+def test_seniority_value():
+    assert seniority_value("all_seniority_levels") == "all"
+    assert seniority_value("entry_level") == "entrylevel"
+    assert seniority_value("mid-senior_level") == "midseniorlevel"
+
+
+def test_compile_filters_URL():
+    params = query_params(compile_filters_URL(URL + "&p=3", {"jobtypes": "full_time", 
+                                                             "postdates": "last_2_weeks",
+                                                             "salaries": ("75K", "$150K"),
+                                                             "companies": 12345}))
+    assert "p" not in params
+    assert params["jobType"] == "fulltime" and params["fromAge"] == "14"
+    assert params["minSalary"] == "75000" and params["maxSalary"] == "150000"
+    assert params["companyId"] == "12345"
+    
+    # URL_part_2 is broken over lines, which leaves spaces in its values.
+    assert params["cityId"] == "-1" and params["employerSizes"] == "0"
+    assert params["sc.keyword"] == "data scientist"
+
+
+def test_id_filters_reject_option_names():
+    with pytest.raises(ValueError):
+        compile_filters_URL(URL, {"industries": "internet"})
+    with pytest.raises(ValueError):
+        compile_filters_URL(URL, {"cityids": True})
+
+
+def test_unknown_options_and_filters():
+    filters = {"jobtypes": ["all_job_types", "full_time", "part_time"]}
+    assert query_params(compile_filters_URL(URL, {"jobtypes": "part_time"}, filters))["jobType"] == "parttime"
+    with pytest.raises(ValueError):
+        compile_filters_URL(URL, {"jobtypes": "contract"}, filters)
+    with pytest.raises(ValueError):
+        compile_filters_URL(URL, {"colors": "blue"})
+    with pytest.raises(ValueError):
+        compile_filters_URL(URL, {"salaries": ("lots", "more")})
@@ -0,0 +1,64 @@
+import pytest
+
+import governor
+from governor import RateGovernor
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(governor.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(governor.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_burst_then_paced(clock):
+    rate_governor = RateGovernor(rate=2.0, burst=2.0)
+    rate_governor.acquire()
+    rate_governor.acquire()
+    assert clock.sleeps == []
+    
+    # The bucket is empty, so the next click waits for one token.
+    rate_governor.acquire()
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_additive_increase_multiplicative_decrease(clock):
+    rate_governor = RateGovernor(rate=1.0, min_rate=0.2, max_rate=1.1, increase=0.05)
+    for _ in range(3):
+        rate_governor.record_success()
+    assert rate_governor.rate == pytest.approx(1.1)
+    
+    rate_governor.record_error("try_again")
+    assert rate_governor.rate == pytest.approx(0.55)
+    rate_governor.record_error("popup", n=10)
+    assert rate_governor.rate == pytest.approx(0.2)
+    assert rate_governor.stats() == {"success": 3, "try_again": 1, "popup": 10, "rate": pytest.approx(0.2)}
+
+
+def test_tokens_accrue_at_the_old_rate(clock):
+    rate_governor = RateGovernor(rate=0.5, burst=10.0, increase=1.0)
+    rate_governor.tokens = 0
+    
+    # Two seconds at 0.5 tokens a second are one token, whatever the
+    # rate is raised to afterwards.
+    clock.now += 2
+    rate_governor.record_success()
+    assert rate_governor.tokens == pytest.approx(1.0)
+    
+    clock.now += 2
+    rate_governor.record_error("timeout")
+    assert rate_governor.tokens == pytest.approx(4.0)
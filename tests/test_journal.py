@@ -0,0 +1,91 @@
+from journal import ScrapeJournal
+
+
+QUERY = {"keyword": "data scientist", "URL": "https://www.glassdoor.com/Job/jobs.htm", 
+         "current_url": "https://www.glassdoor.com/Job/jobs.htm", "filters": {}}
+
+
+def scrape_page(journal, page, job_ids, commit=True):
+    journal.begin_page(page)
+    for job_id in job_ids:
+        journal.record_job(page, {"job id": job_id})
+    if commit:
+        journal.commit_page(page)
+
+
+def committed_ids(journal):
+    return [job["job id"] for job in journal.committed_jobs()]
+
+
+def test_crash_and_resume(tmp_path):
+    journal = ScrapeJournal(tmp_path / "journal.jsonl")
+    journal.begin_query(QUERY)
+    scrape_page(journal, 1, [1, 2, 3])
+    scrape_page(journal, 2, [10, 11], commit=False)
+    journal.close()  # Crash part way through page 2.
+
+    journal = ScrapeJournal(tmp_path / "journal.jsonl")
+    state = journal.load()
+    assert journal.matches(QUERY, state)
+    assert state["page_counter"] == 1 and state["n_jobs"] == 3
+
+    scrape_page(journal, 2, [10, 11, 12])
+    state = journal.load()
+    assert state["page_counter"] == 2 and state["n_jobs"] == 6
+    assert committed_ids(journal) == [1, 2, 3, 10, 11, 12]
+    journal.close()
+
+
+def test_early_stop_and_resume(tmp_path):
+    journal = ScrapeJournal(tmp_path / "journal.jsonl")
+    journal.begin_query(QUERY)
+    scrape_page(journal, 1, [1, 2])
+
+    # Stopping at n_jobs part way through page 2 leaves it uncommitted.
+    scrape_page(journal, 2, [10], commit=False)
+    assert journal.load()["n_jobs"] == 2
+
+    # The next run starts page 2 over.
+    scrape_page(journal, 2, [10, 11])
+    scrape_page(journal, 3, [20])
+    state = journal.load()
+    assert state["page_counter"] == 3 and state["n_jobs"] == 5
+    assert committed_ids(journal) == [1, 2, 10, 11, 20]
+    journal.close()
+
+
+def test_jobs_of_committed_pages_are_not_counted_again(tmp_path):
+    journal = ScrapeJournal(tmp_path / "journal.jsonl")
+    journal.begin_query(QUERY)
+    scrape_page(journal, 1, [1, 2])
+    journal.record_job(1, {"job id": 2})
+    scrape_page(journal, 2, [10])
+    assert committed_ids(journal) == [1, 2, 10]
+    journal.close()
+
+
+def test_torn_line_and_new_query(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = ScrapeJournal(path)
+    journal.begin_query(QUERY)
+    scrape_page(journal, 1, [1])
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"event": "job", "pa')
+
+    journal = ScrapeJournal(path)
+    assert journal.load()["n_jobs"] == 1
+    journal.begin_query(dict(QUERY, keyword="data engineer"))
+    scrape_page(journal, 1, [5])
+    assert committed_ids(journal) == [5]
+    assert journal.load()["query"]["keyword"] == "data engineer"
+    journal.close()
+
+
+def test_matches_filters_but_not_page(tmp_path):
+    journal = ScrapeJournal(tmp_path / "journal.jsonl")
+    journal.begin_query(dict(QUERY, current_url=QUERY["current_url"] + "?jobType=fulltime&p=3"))
+    state = journal.load()
+    assert journal.matches(dict(QUERY, current_url=QUERY["current_url"] + "?jobType=fulltime"), state)
+    assert not journal.matches(dict(QUERY, current_url=QUERY["current_url"] + "?jobType=parttime"), state)
+    journal.close()
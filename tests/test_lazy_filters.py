@@ -0,0 +1,36 @@
+from lazy_filters import LazyFilters
+
+
+def make_filters():
+    refreshed = []
+
+    def refresh(name):
+        refreshed.append(name)
+        filters[name] = [f"{name} (refreshed)"]
+
+    filters = LazyFilters(refresh)
+    filters["jobtypes"] = ["All Job Types"]
+    filters["companies"] = ["Acme"]
+    return filters, refreshed
+
+
+def test_change_invalidates_every_filter_read():
+    filters, refreshed = make_filters()
+    assert filters["companies"] == ["Acme"] and refreshed == []
+
+    filters.mark_changed()
+    assert filters["companies"] == ["companies (refreshed)"]
+    assert filters.get("jobtypes") == ["jobtypes (refreshed)"]
+    assert filters["companies"] == ["companies (refreshed)"]
+    assert refreshed == ["companies", "jobtypes"]
+
+
+def test_peek_does_not_refresh():
+    filters, refreshed = make_filters()
+    filters.mark_changed()
+    assert filters.peek("companies") == ["Acme"]
+    assert filters.peek_all() == {"jobtypes": ["All Job Types"], "companies": ["Acme"]}
+    assert refreshed == []
+
+    filters["companies"] = ["Initech"]
+    assert filters["companies"] == ["Initech"] and refreshed == []
@@ -0,0 +1,22 @@
+import pytest
+
+from parallel import assign_pages
+
+
+def test_contiguous():
+    assert assign_pages(range(1, 8), 3, "contiguous") == [[1, 2, 3], [4, 5], [6, 7]]
+
+
+def test_interleaved():
+    assert assign_pages(range(1, 8), 3, "interleaved") == [[1, 4, 7], [2, 5], [3, 6]]
+
+
+def test_more_workers_than_pages():
+    assert assign_pages([5, 2, 2], 4) == [[2], [5]]
+    assert assign_pages([], 4) == []
+
+
+def test_explicit_assignment():
+    assert assign_pages(range(1, 8), 2, [[1, 3], [], (2,)]) == [[1, 3], [2]]
+    with pytest.raises(ValueError):
+        assign_pages(range(1, 8), 2, "random")
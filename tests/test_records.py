@@ -0,0 +1,64 @@
+import pytest
+
+from elements import WebScrapingElements
+from records import JobRecord, jobs_to_frame, records_to_columns
+
+
+def test_job_record_reads_like_a_dict():
+    record = JobRecord(company="Acme", job_title="Data Scientist")
+    assert record["job title"] == "Data Scientist"
+    assert record.get("size") is None and record.get("unknown", -1) == -1
+    assert list(dict(record)) == list(JobRecord.FEATURES)
+    
+    # Jobs loaded back from a journal are dicts with -1 for missing features.
+    assert JobRecord.from_dict(dict(record.to_dict(), size=-1)) == record
+
+
+def test_records_to_columns_reads_records_and_dicts():
+    jobs = [JobRecord(company="Acme", industry="Internet"), 
+            {"company": "Initech", "industry": -1, "job title": None}]
+    columns = records_to_columns(jobs, ["company", "industry", "unknown"])
+    assert columns == {"company": ["Acme", "Initech"], 
+                       "industry": ["Internet", None], 
+                       "unknown": [None, None]}
+
+
+def test_jobs_to_frame():
+    frame = jobs_to_frame([JobRecord(company="Acme"), JobRecord(company="Initech", size="1 to 50 employees")])
+    assert list(frame.columns) == list(JobRecord.FEATURES)
+    assert all(dtype == "string" for dtype in frame.dtypes)
+    assert frame["size"].isna().tolist() == [True, False]
+    
+    # Card dicts fall back to a list of dicts.
+    frame = jobs_to_frame([{"job id": 1, "link": "https://www.glassdoor.com/"}])
+    assert frame["job id"].tolist() == [1]
+
+
+def test_records_to_batch():
+    pa = pytest.importorskip("pyarrow")
+    from records import records_to_batch
+    
+    batch = records_to_batch([JobRecord(company="Acme"), {"company": "Acme", "sector": -1}],
+                             ["company", "sector"], ["company"])
+    assert batch.schema.field("company").type == pa.dictionary(pa.int32(), pa.string())
+    assert batch.column(0).to_pylist() == ["Acme", "Acme"]
+    assert batch.column(1).null_count == 2
+
+
+def test_parse_jobinfo():
+    record = WebScrapingElements().parse_jobinfo({
+        "jobinfo1": ["Acme", "Data Scientist", "San Francisco, CA"],
+        "jobinfo2": ["Full-time", "Remote"],
+        "jobinfo3": "Size\n51 to 200 Employees\nFounded\n2008\nCEO\nJane Doe\nRevenue",
+        "jobinfo4": "Build models."
+    })
+    assert record == JobRecord(company="Acme", 
+                               job_title="Data Scientist", 
+                               headquarters="San Francisco, CA",
+                               job_type="Full-time",
+                               size="51 to 200 employees",
+                               founded="2008",
+                               job_description="Build models.")
+    
+    # Every feature of a joblisting with no job info is missing.
+    assert WebScrapingElements().parse_jobinfo({}) == JobRecord()
@@ -0,0 +1,15 @@
+from seen_index import SeenJobIndex
+
+
+def test_commit_and_rollback(tmp_path):
+    index = SeenJobIndex(str(tmp_path / "seen.db"), use_bloom=True)
+    index.add("id:1")
+    index.commit()
+    index.add("id:2")
+    index.rollback()
+    assert "id:1" in index and "id:2" not in index
+    index.close()
+
+    index = SeenJobIndex(str(tmp_path / "seen.db"))
+    assert len(index) == 1
+    index.close()
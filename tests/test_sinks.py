@@ -0,0 +1,48 @@
+import pytest
+
+from sinks import ArrowSink
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def make_jobinfo(idx):
+    return {"company": f"Company {idx % 2}", 
+            "job title": f"Job {idx}", 
+            "industry": -1 if idx % 3 == 0 else "Internet",
+            "revenue": None,
+            "unknown feature": "dropped"}
+
+
+def test_parquet_round_trip(tmp_path):
+    path = str(tmp_path / "jobs.parquet")
+    with ArrowSink(path, row_group_size=2, fields=["company", "job title", "industry", "revenue"],
+                   dictionary_fields=["company", "industry"]) as sink:
+        assert sink.write_many(make_jobinfo(idx) for idx in range(5)) == 5
+    
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_row_groups == 3
+    
+    table = parquet_file.read()
+    assert table.column_names == ["company", "job title", "industry", "revenue"]
+    assert pa.types.is_dictionary(table.schema.field("company").type)
+    assert not pa.types.is_dictionary(table.schema.field("job title").type)
+    assert table.column("company").to_pylist() == ["Company 0", "Company 1"] * 2 + ["Company 0"]
+    assert table.column("industry").to_pylist() == [None, "Internet", "Internet", None, "Internet"]
+    assert table.column("revenue").null_count == 5
+
+
+def test_arrow_stream_round_trip(tmp_path):
+    path = str(tmp_path / "jobs.arrows")
+    with ArrowSink(path, file_format="arrow", row_group_size=2) as sink:
+        sink.write_many(make_jobinfo(idx) for idx in range(3))
+    
+    with pa.ipc.open_stream(path) as reader:
+        batches = list(reader)
+    assert [batch.num_rows for batch in batches] == [2, 1]
+    assert pa.Table.from_batches(batches).column("job title").to_pylist() == ["Job 0", "Job 1", "Job 2"]
+
+
+def test_unknown_file_format(tmp_path):
+    with pytest.raises(ValueError):
+        ArrowSink(str(tmp_path / "jobs.csv"), file_format="csv")